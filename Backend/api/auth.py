@@ -11,23 +11,23 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     auth_service = AuthService(db)
-    return auth_service.register(user_data)
+    return await auth_service.register(user_data)
 
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     auth_service = AuthService(db)
-    return auth_service.login(user_data)
+    return await auth_service.login(user_data)
 
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     auth_service = AuthService(db)
-    return auth_service.login_with_form(form_data.username, form_data.password)
+    return await auth_service.login_with_form(form_data.username, form_data.password)
 
 
 @router.get("/profile", response_model=UserResponse)
-def get_profile(current_user: UserResponse = Depends(get_current_user)):
+async def get_profile(current_user: UserResponse = Depends(get_current_user)):
     return current_user
\ No newline at end of file
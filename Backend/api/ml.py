@@ -1,25 +1,230 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import base64
+import binascii
+import queue
+from datetime import datetime
+from typing import AsyncIterator, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from Backend.config import get_settings
 from Backend.database import get_db
-from Backend.services.ml_service import MLService
-from Backend.models.schemas import MLImageUpload, RecognizeResponse, SegmentationResponse, UserResponse
+from Backend.services.inference_pool import (
+    get_inference_pool,
+    recognize_image_chunks,
+    run_recognize,
+    run_segment,
+    run_recognize_upload,
+    run_segment_upload
+)
+from Backend.services.jobs import Job, get_job_queue
+from Backend.services.upload_store import StoredUpload, get_upload_store
+from Backend.models.schemas import (
+    MLImageUpload,
+    MLBatchUpload,
+    RecognizeResponse,
+    BatchRecognizeResponse,
+    SegmentationResponse,
+    MLJobResponse,
+    UserResponse
+)
+from Backend.utils.multipart_stream import MultipartFileReader
 from Backend.utils.security import get_current_user
 
 router = APIRouter(prefix="/api/ml", tags=["ml"])
 
+# Запас к ml_max_upload_bytes на границы, заголовки частей и мелкие поля multipart-запроса
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
 @router.post("/recognize", response_model=RecognizeResponse)
-def recognize_clothing(
+async def recognize_clothing(
     image_data: MLImageUpload,
     current_user: UserResponse = Depends(get_current_user)
 ):
-    ml_service = MLService()
-    return ml_service.recognize_clothing(image_data)
+    return await get_inference_pool().submit(run_recognize, image_data)
+
+@router.post("/recognize/batch", response_model=BatchRecognizeResponse)
+async def recognize_clothing_batch(
+    batch: MLBatchUpload,
+    stream: bool = False,
+    partial: bool = True,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Распознает несколько фотографий за один запрос.
+
+    С partial=true ошибки отдельных изображений возвращаются в поле error,
+    с partial=false первая ошибка завершает запрос. С stream=true ответ отдается как NDJSON:
+    по строке на изображение по мере готовности (ошибки в этом режиме всегда построчные).
+    """
+    chunks = recognize_image_chunks(batch.images, partial=partial or stream)
+
+    if stream:
+        async def ndjson():
+            tasks = [asyncio.ensure_future(chunk) for chunk in chunks]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    for result in await task:
+                        yield result.model_dump_json() + "\n"
+            finally:
+                # Клиент отключился: оставшиеся части не должны занимать слоты пула инференса
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results = [result for chunk in await asyncio.gather(*chunks) for result in chunk]
+    if not partial:
+        failed = next((result for result in results if result.error), None)
+        if failed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Image {failed.index} ({failed.file_name}): {failed.error}"
+            )
+    return BatchRecognizeResponse(results=results)
 
 @router.post("/segment", response_model=SegmentationResponse)
-def segment_image(
+async def segment_image(
     image_data: MLImageUpload,
     current_user: UserResponse = Depends(get_current_user)
 ):
-    ml_service = MLService()
-    return ml_service.segment_image(image_data)
\ No newline at end of file
+    return await get_inference_pool().submit(run_segment, image_data)
+
+@router.post("/recognize/file", response_model=RecognizeResponse)
+async def recognize_clothing_file(
+    request: Request,
+    file_name: str = "upload.jpg",
+    current_user: UserResponse = Depends(get_current_user)
+):
+    upload, file_name = await _receive_upload(request, file_name)
+    return await get_inference_pool().submit(run_recognize_upload, upload, file_name)
+
+@router.post("/segment/file", response_model=SegmentationResponse)
+async def segment_image_file(
+    request: Request,
+    file_name: str = "upload.jpg",
+    current_user: UserResponse = Depends(get_current_user)
+):
+    upload, file_name = await _receive_upload(request, file_name)
+    return await get_inference_pool().submit(run_segment_upload, upload)
+
+@router.post("/jobs/recognize", response_model=MLJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_recognize_job(
+    image_data: MLImageUpload,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    _ensure_job_capacity()
+    upload = await _store_base64(image_data)
+    return _job_response(_submit_job("recognize", current_user.id, run_recognize_upload, upload, image_data.file_name))
+
+@router.post("/jobs/segment", response_model=MLJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_segment_job(
+    image_data: MLImageUpload,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    _ensure_job_capacity()
+    upload = await _store_base64(image_data)
+    return _job_response(_submit_job("segment", current_user.id, run_segment_upload, upload))
+
+@router.get("/jobs/{job_id}", response_model=MLJobResponse)
+def get_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    job = get_job_queue().get(job_id)
+    # Чужие задачи не отличаем от несуществующих
+    if job is None or job.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return _job_response(job)
+
+def _ensure_job_capacity() -> None:
+    # Проверяем очередь до сохранения файла, чтобы отказ 429 не оставлял в uploads/ ненужных загрузок
+    if get_job_queue().is_full:
+        raise _jobs_busy()
+
+def _submit_job(kind: str, owner_id: int, func, *args) -> Job:
+    try:
+        return get_job_queue().submit(kind, owner_id, func, *args)
+    except queue.Full:
+        # Очередь заполнилась, пока сохранялся файл; он не попадет в гардероб и будет удален сборщиком мусора
+        raise _jobs_busy()
+
+def _jobs_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many recognition jobs are queued. Please try again later.",
+        headers={"Retry-After": "5"}
+    )
+
+def _job_response(job: Job) -> MLJobResponse:
+    return MLJobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        result=job.result,
+        error=job.error,
+        created_at=datetime.fromtimestamp(job.created_at),
+        finished_at=datetime.fromtimestamp(job.finished_at) if job.finished_at else None
+    )
+
+async def _store_base64(image_data: MLImageUpload) -> StoredUpload:
+    # Изображение сохраняем сразу, чтобы в очереди лежал путь к файлу, а не base64-строка
+    try:
+        image_binary = base64.b64decode(image_data.file_data)
+    except (binascii.Error, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to save image: {str(e)}"
+        )
+    return await run_in_threadpool(get_upload_store().put_bytes, image_binary)
+
+async def _limit_body(stream: AsyncIterator[bytes], max_size: int) -> AsyncIterator[bytes]:
+    size = 0
+    async for chunk in stream:
+        size += len(chunk)
+        if size > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Request body is too large. Maximum size is {max_size} bytes."
+            )
+        yield chunk
+
+async def _receive_upload(request: Request, file_name: str) -> Tuple[StoredUpload, str]:
+    """Принимает изображение как multipart/form-data (поле file) или как сырое тело application/octet-stream."""
+    max_size = get_settings().ml_max_upload_bytes
+
+    # Заведомо слишком большие запросы отклоняем до чтения тела
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Image is too large. Maximum size is {max_size} bytes."
+        )
+
+    store = get_upload_store()
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        # Тело разбирается по мере чтения, и байты поля file сразу идут в хранилище: лимит срабатывает
+        # во время чтения, даже без Content-Length, и файл не пишется на диск дважды
+        try:
+            reader = MultipartFileReader(content_type)
+            upload = await store.put_stream(
+                reader.chunks(_limit_body(request.stream(), max_size + MULTIPART_OVERHEAD_BYTES)), max_size
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid multipart request: {str(e)}"
+            )
+        return upload, reader.filename or file_name
+
+    if content_type.startswith("application/octet-stream") or content_type.startswith("image/"):
+        upload = await store.put_stream(request.stream(), max_size)
+        return upload, file_name
+
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Use multipart/form-data or application/octet-stream"
+    )
\ No newline at end of file
@@ -1,9 +1,11 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from Backend.async_database import get_async_db
 from Backend.database import get_db
-from Backend.services.outfit_service import OutfitService
+from Backend.services.outfit_service import AsyncOutfitService, OutfitService
 from Backend.models.schemas import (
     OutfitCreate,
     OutfitUpdate,
@@ -17,16 +19,16 @@ from Backend.utils.security import get_current_user
 router = APIRouter(prefix="/api/outfits", tags=["outfits"])
 
 @router.get("", response_model=OutfitsPage)
-def get_outfits(
+async def get_outfits(
     page: int = 1,
     size: int = 10,
     occasion: Optional[str] = None,
     is_favorite: Optional[bool] = None,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    outfit_service = OutfitService(db)
-    return outfit_service.get_outfits(current_user.id, page, size, occasion, is_favorite)
+    outfit_service = AsyncOutfitService(db)
+    return await outfit_service.get_outfits(current_user.id, page, size, occasion, is_favorite)
 
 @router.post("", response_model=OutfitResponse)
 def create_outfit(
@@ -38,13 +40,13 @@ def create_outfit(
     return outfit_service.create_outfit(current_user.id, outfit_data)
 
 @router.get("/{outfit_id}", response_model=OutfitResponse)
-def get_outfit(
+async def get_outfit(
     outfit_id: int,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    outfit_service = OutfitService(db)
-    return outfit_service.get_outfit(outfit_id, current_user.id)
+    outfit_service = AsyncOutfitService(db)
+    return await outfit_service.get_outfit(outfit_id, current_user.id)
 
 @router.put("/{outfit_id}", response_model=OutfitResponse)
 def update_outfit(
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
+from ..async_database import get_async_db
 from ..database import get_db
-from ..repositories.user_repository import UserRepository
+from ..repositories.user_repository import AsyncUserRepository, UserRepository
 from ..services.colortype_service import ColorTypeService
 from ..models.schemas import (
     OnboardingUpdate,
@@ -47,12 +49,12 @@ def get_color_recommendations(
 
 
 @router.get("/me/favorites", response_model=List[int])
-def get_favorite_outfits(
+async def get_favorite_outfits(
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user_repo = UserRepository(db)
-    return user_repo.get_favorite_outfits(current_user.id)
+    user_repo = AsyncUserRepository(db)
+    return await user_repo.get_favorite_outfits(current_user.id)
 
 
 @router.post("/me/favorites/{outfit_id}", status_code=status.HTTP_200_OK)
@@ -1,26 +1,40 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from Backend.async_database import get_async_db
 from Backend.database import get_db
-from Backend.services.wardrobe_service import WardrobeService
-from Backend.models.schemas import WardrobeItemCreate, WardrobeItemUpdate, WardrobeItemResponse, WardrobeItemsPage, UserResponse
+from Backend.services.inference_pool import recognize_images
+from Backend.services.wardrobe_service import AsyncWardrobeService, WardrobeService
+from Backend.models.schemas import (
+    WardrobeItemCreate,
+    WardrobeItemUpdate,
+    WardrobeItemResponse,
+    WardrobeItemsPage,
+    WardrobeItemsBatchCreate,
+    WardrobeItemsBatchResponse,
+    RecognizeIngestRequest,
+    RecognizeIngestResponse,
+    UserResponse
+)
 from Backend.utils.security import get_current_user
 
 router = APIRouter(prefix="/api/wardrobe", tags=["wardrobe"])
 
 @router.get("/items", response_model=WardrobeItemsPage)
-def get_wardrobe_items(
+async def get_wardrobe_items(
     page: int = 1,
     size: int = 10,
     type: Optional[str] = None,
     color: Optional[str] = None,
     season: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    wardrobe_service = WardrobeService(db)
-    return wardrobe_service.get_items(current_user.id, page, size, type, color, season)
+    wardrobe_service = AsyncWardrobeService(db)
+    return await wardrobe_service.get_items(current_user.id, page, size, type, color, season)
 
 @router.post("/items", response_model=WardrobeItemResponse)
 def create_wardrobe_item(
@@ -31,6 +45,28 @@ def create_wardrobe_item(
     wardrobe_service = WardrobeService(db)
     return wardrobe_service.create_item(current_user.id, item_data)
 
+@router.post("/items:batch", response_model=WardrobeItemsBatchResponse)
+def create_wardrobe_items(
+    batch: WardrobeItemsBatchCreate,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    wardrobe_service = WardrobeService(db)
+    return wardrobe_service.create_items(current_user.id, batch.items)
+
+@router.post("/items:recognize", response_model=RecognizeIngestResponse)
+async def recognize_wardrobe_items(
+    request: RecognizeIngestRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # Распознавание и создание вещей за один запрос: фото с ошибкой не мешают сохранить остальные
+    results = await recognize_images(request.images)
+    wardrobe_service = WardrobeService(db)
+    return await run_in_threadpool(
+        wardrobe_service.create_items_from_recognition, current_user.id, results, request.season
+    )
+
 @router.put("/items/{item_id}", response_model=WardrobeItemResponse)
 def update_wardrobe_item(
     item_id: int,
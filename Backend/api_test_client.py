@@ -17,9 +17,9 @@ class ApiTestClient:
             'Authorization': f'Bearer {token}'
         }
 
-    def get(self, endpoint, params=None):
+    def get(self, endpoint, params=None, headers=None):
         url = f"{self.base_url}{endpoint}"
-        response = requests.get(url, headers=self.headers, params=params)
+        response = requests.get(url, headers=dict(self.headers, **(headers or {})), params=params)
         return response
 
     def post(self, endpoint, json_data=None):
@@ -27,6 +27,19 @@ class ApiTestClient:
         response = requests.post(url, headers=self.headers, json=json_data)
         return response
 
+    def post_raw(self, endpoint, data, content_type='application/octet-stream', params=None):
+        url = f"{self.base_url}{endpoint}"
+        headers = dict(self.headers, **{'Content-Type': content_type})
+        response = requests.post(url, headers=headers, data=data, params=params)
+        return response
+
+    def post_files(self, endpoint, files):
+        url = f"{self.base_url}{endpoint}"
+        # Content-Type с boundary для multipart выставляет сам requests
+        headers = {key: value for key, value in self.headers.items() if key != 'Content-Type'}
+        response = requests.post(url, headers=headers, files=files)
+        return response
+
     def put(self, endpoint, json_data=None):
         url = f"{self.base_url}{endpoint}"
         response = requests.put(url, headers=self.headers, json=json_data)
@@ -92,4 +92,20 @@ def test_update_onboarding_status(client, user_data):
 
     assert response.status_code == 200
     data = response.json()
-    assert data["onboarding_completed"] is True
\ No newline at end of file
+    assert data["onboarding_completed"] is True
+
+def test_profile_reflects_onboarding_update(client, user_data):
+    response = client.post("/api/auth/register", json_data=user_data)
+    client.set_token(response.json()["access_token"])
+
+    assert client.get("/api/auth/profile").json()["onboarding_completed"] is False
+
+    client.put("/api/users/me/onboarding", json_data={"onboarding_completed": True})
+    response = client.get("/api/auth/profile")
+
+    assert response.status_code == 200
+    assert response.json()["onboarding_completed"] is True
+
+def test_metrics_hidden_without_token(client):
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"X-Metrics-Token": "wrong"}).status_code == 404
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Таблица цветов проверяется напрямую, без сервера: она должна совпадать с цепочкой условий classify_color
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend import reqcol1 as reqcol
+
+def sample_colors():
+    rng = np.random.default_rng(0)
+    random_colors = rng.integers(0, 256, size=(100000, 3))
+    # Каждое пятое значение по всем осям плюс пороги из classify_color и соседние с ними значения
+    thresholds = {30, 50, 100, 150, 200, 240}
+    values = sorted(set(range(0, 256, 5)) | {t + d for t in thresholds for d in (-1, 0, 1)} | {255})
+    grid = np.stack(np.meshgrid(values, values, values, indexing="ij"), axis=-1).reshape(-1, 3)
+    return np.concatenate([random_colors, grid])
+
+def expected_codes(colors):
+    return np.array([reqcol.COLOR_NAMES.index(reqcol.classify_color(tuple(int(c) for c in rgb))) for rgb in colors])
+
+@pytest.fixture
+def lut_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "color_lut.npy")
+    monkeypatch.setattr(reqcol, "color_lut_path", lambda: path)
+    reqcol.get_color_lut.cache_clear()
+    yield path
+    reqcol.get_color_lut.cache_clear()
+
+def test_classify_color_array_matches_classify_color():
+    colors = sample_colors()
+
+    assert np.array_equal(reqcol.classify_color_array(colors), expected_codes(colors))
+
+def test_color_lut_matches_classify_color(lut_path):
+    colors = sample_colors()
+    expected = expected_codes(colors)
+
+    pixels = colors.astype(np.uint8)
+    assert np.array_equal(reqcol.classify_colors(pixels), expected)
+    assert os.path.exists(lut_path)
+
+    # Сохраненная таблица читается заново и дает тот же результат
+    reqcol.get_color_lut.cache_clear()
+    assert np.array_equal(reqcol.classify_colors(pixels), expected)
@@ -0,0 +1,209 @@
+import base64
+import io
+import json
+import time
+import pytest
+from PIL import Image
+from api_test_client import ApiTestClient
+
+@pytest.fixture
+def auth_client():
+    client = ApiTestClient()
+    client.register_user()
+    return client
+
+@pytest.fixture
+def image_bytes():
+    image = Image.new("RGB", (120, 120), (255, 255, 255))
+    image.paste((200, 20, 20), (30, 30, 90, 90))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG")
+    return buffer.getvalue()
+
+def test_recognize_base64(auth_client, image_bytes):
+    image_data = {
+        "file_data": base64.b64encode(image_bytes).decode(),
+        "file_name": "tshirt.jpg"
+    }
+
+    response = auth_client.post("/api/ml/recognize", json_data=image_data)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["detected_items"]) > 0
+    assert "type" in data["detected_items"][0]
+    assert "color" in data["detected_items"][0]
+
+def test_recognize_octet_stream(auth_client, image_bytes):
+    response = auth_client.post_raw("/api/ml/recognize/file", image_bytes, params={"file_name": "tshirt.jpg"})
+
+    assert response.status_code == 200
+    assert len(response.json()["detected_items"]) > 0
+
+def test_recognize_batch_reports_per_image_errors(auth_client, image_bytes):
+    encoded = base64.b64encode(image_bytes).decode()
+    batch = {
+        "images": [
+            {"file_data": encoded, "file_name": "tshirt.jpg"},
+            {"file_data": base64.b64encode(b"not an image").decode(), "file_name": "broken.jpg"},
+            {"file_data": encoded, "file_name": "dress.jpg"}
+        ]
+    }
+
+    response = auth_client.post("/api/ml/recognize/batch", json_data=batch)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert len(results[0]["detected_items"]) > 0
+    assert results[1]["error"]
+    assert results[1]["detected_items"] == []
+    assert len(results[2]["detected_items"]) > 0
+
+def test_recognize_batch_without_partial_fails(auth_client):
+    batch = {"images": [{"file_data": base64.b64encode(b"not an image").decode(), "file_name": "broken.jpg"}]}
+
+    response = auth_client.post("/api/ml/recognize/batch?partial=false", json_data=batch)
+
+    assert response.status_code == 400
+
+def test_recognize_batch_stream(auth_client, image_bytes):
+    encoded = base64.b64encode(image_bytes).decode()
+    batch = {"images": [{"file_data": encoded, "file_name": f"item{i}.jpg"} for i in range(3)]}
+
+    response = auth_client.post("/api/ml/recognize/batch?stream=true", json_data=batch)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+
+def test_segment_multipart(auth_client, image_bytes):
+    response = auth_client.post_files("/api/ml/segment/file", {"file": ("tshirt.jpg", image_bytes, "image/jpeg")})
+
+    assert response.status_code == 200
+    assert response.json()["segmented_image_url"].startswith("/uploads/")
+
+def test_multipart_size_limit_applies_while_reading(auth_client):
+    # Chunked-тело без Content-Length: лимит должен сработать при чтении, а не после сохранения всего тела
+    def body():
+        yield b'--boundary\r\nContent-Disposition: form-data; name="file"; filename="big.jpg"\r\n\r\n'
+        for _ in range(64):
+            yield b"x" * (1024 * 1024)
+        yield b"\r\n--boundary--\r\n"
+
+    response = auth_client.post_raw("/api/ml/segment/file", body(), content_type="multipart/form-data; boundary=boundary")
+
+    assert response.status_code == 413
+
+def test_multipart_requires_file_field(auth_client):
+    body = b'--boundary\r\nContent-Disposition: form-data; name="note"\r\n\r\nhello\r\n--boundary--\r\n'
+
+    response = auth_client.post_raw("/api/ml/segment/file", body, content_type="multipart/form-data; boundary=boundary")
+
+    assert response.status_code == 400
+
+def test_upload_derivatives_are_served(auth_client, image_bytes):
+    response = auth_client.post_raw("/api/ml/segment/file", image_bytes, params={"file_name": "tshirt.jpg"})
+    segmented_url = response.json()["segmented_image_url"]
+    stem = segmented_url.rsplit(".", 1)[0]
+
+    thumb = auth_client.get(f"{stem}_thumb.webp")
+    medium = auth_client.get(f"{stem}_medium.webp")
+    missing = auth_client.get(f"{stem}_huge.webp")
+
+    assert thumb.status_code == 200
+    assert thumb.headers["content-type"] == "image/webp"
+    assert medium.status_code == 200
+    assert missing.status_code == 404
+
+def test_uploads_are_cached_by_clients(auth_client, image_bytes):
+    image_data = {"file_data": base64.b64encode(image_bytes).decode(), "file_name": "tshirt.jpg"}
+    url = auth_client.post("/api/ml/recognize/batch", json_data={"images": [image_data]}).json()["results"][0]["image_url"]
+
+    response = auth_client.get(url)
+    not_modified = auth_client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    partial = auth_client.get(url, headers={"Range": "bytes=0-9"})
+
+    assert response.status_code == 200
+    assert "immutable" in response.headers["cache-control"]
+    assert not_modified.status_code == 304
+    assert partial.status_code == 206
+    assert partial.content == response.content[:10]
+
+def test_generated_uploads_are_revalidated(auth_client, image_bytes):
+    segmented_url = auth_client.post_raw("/api/ml/segment/file", image_bytes, params={"file_name": "tshirt.jpg"}).json()["segmented_image_url"]
+    thumb_url = f"{segmented_url.rsplit('.', 1)[0]}_thumb.webp"
+
+    for url in (segmented_url, thumb_url):
+        response = auth_client.get(url)
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "no-cache"
+
+def test_same_image_is_stored_once(auth_client, image_bytes):
+    first = auth_client.post_files("/api/ml/segment/file", {"file": ("a.jpg", image_bytes, "image/jpeg")})
+    second = auth_client.post_raw("/api/ml/segment/file", image_bytes, params={"file_name": "b.jpg"})
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert first.json()["segmented_image_url"] == second.json()["segmented_image_url"]
+
+def test_stored_name_ignores_client_extension(auth_client, image_bytes):
+    encoded = base64.b64encode(image_bytes).decode()
+    batch = {"images": [{"file_data": encoded, "file_name": "a.JPEG"}, {"file_data": encoded, "file_name": "b.png"}]}
+
+    response = auth_client.post("/api/ml/recognize/batch", json_data=batch)
+
+    assert response.status_code == 200
+    first, second = response.json()["results"]
+    assert first["image_url"] == second["image_url"]
+    # Расширение берется из формата изображения, а не из имени файла
+    assert first["image_url"].endswith(".jpg")
+
+def test_upload_requires_supported_content_type(auth_client):
+    response = auth_client.post("/api/ml/recognize/file", json_data={})
+
+    assert response.status_code == 415
+
+def test_recognize_job(auth_client, image_bytes):
+    image_data = {
+        "file_data": base64.b64encode(image_bytes).decode(),
+        "file_name": "tshirt.jpg"
+    }
+
+    response = auth_client.post("/api/ml/jobs/recognize", json_data=image_data)
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(50):
+        job = auth_client.get(f"/api/ml/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed"):
+            break
+        time.sleep(0.1)
+
+    assert job["status"] == "succeeded"
+    assert len(job["result"]["detected_items"]) > 0
+
+def test_job_of_another_user_is_not_found(auth_client, image_bytes):
+    image_data = {
+        "file_data": base64.b64encode(image_bytes).decode(),
+        "file_name": "tshirt.jpg"
+    }
+    job_id = auth_client.post("/api/ml/jobs/segment", json_data=image_data).json()["job_id"]
+
+    other_client = ApiTestClient()
+    other_client.register_user()
+    response = other_client.get(f"/api/ml/jobs/{job_id}")
+
+    assert response.status_code == 404
+
+def test_readiness_reports_ml_state():
+    client = ApiTestClient()
+
+    response = client.get("/health/ready")
+
+    assert response.status_code in (200, 503)
+    data = response.json()
+    assert data["status"] in ("ready", "warming_up")
+    assert data["ml_ready"] == (response.status_code == 200)
\ No newline at end of file
@@ -67,6 +67,22 @@ def test_get_outfits(auth_client, outfit):
     assert "items" in data
     assert len(data["items"]) > 0
 
+def test_get_outfits_filtered_includes_wardrobe_items(auth_client, outfit):
+    response = auth_client.get("/api/outfits", params={"occasion": outfit["occasion"], "size": 1})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["size"] == 1
+    assert data["total"] >= 1
+    assert all(o["occasion"] == outfit["occasion"] for o in data["items"])
+    # Вещи образа подгружаются сразу, без ленивой загрузки
+    for outfit_item in data["items"][0]["items"]:
+        assert outfit_item["wardrobe_item"]["id"] == outfit_item["wardrobe_item_id"]
+
+    response = auth_client.get("/api/outfits", params={"occasion": "нет такого повода"})
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
 def test_get_outfit_by_id(auth_client, outfit):
     if outfit is None:
         pytest.skip("Нет тестового образа для проверки")
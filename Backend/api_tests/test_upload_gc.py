@@ -0,0 +1,176 @@
+import hashlib
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Сборщик мусора проверяется напрямую, без сервера: на временном каталоге uploads/ и временной базе
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from Backend.database import Base
+from Backend.models.domain import Product, UploadBlob, WardrobeItem
+from Backend.services.upload_gc import UploadGarbageCollector
+
+GRACE_SECONDS = 3600
+OLD = GRACE_SECONDS * 2
+
+def digest_of(name):
+    return hashlib.sha256(name.encode()).hexdigest()
+
+def shard(digest):
+    return f"{digest[:2]}/{digest[2:4]}"
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    path = tmp_path / "uploads"
+    path.mkdir()
+    return str(path)
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'gc.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def collector(upload_dir, session_factory):
+    return UploadGarbageCollector(upload_dir, grace_seconds=GRACE_SECONDS, session_factory=session_factory)
+
+def write(upload_dir, relative_path, age_seconds=OLD):
+    path = os.path.join(upload_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * 10)
+    mtime = time.time() - age_seconds
+    os.utime(path, (mtime, mtime))
+    return path
+
+def add(session_factory, *rows):
+    db = session_factory()
+    try:
+        db.add_all(rows)
+        db.commit()
+    finally:
+        db.close()
+
+def test_keeps_files_within_grace_period(collector, upload_dir):
+    fresh = write(upload_dir, f"{shard(digest_of('fresh'))}/{digest_of('fresh')}.jpg", age_seconds=60)
+    old = write(upload_dir, f"{shard(digest_of('old'))}/{digest_of('old')}.jpg")
+
+    report = collector.collect()
+
+    assert report.deleted == 1
+    assert report.reclaimed_bytes == 10
+    assert os.path.exists(fresh)
+    assert not os.path.exists(old)
+
+def test_keeps_referenced_digest_with_derivatives(collector, upload_dir, session_factory):
+    item, product, orphan = digest_of("item"), digest_of("product"), digest_of("orphan")
+    add(
+        session_factory,
+        WardrobeItem(user_id=1, name="Item", image_url=f"/uploads/{shard(item)}/{item}.jpg"),
+        Product(name="Product", image_url=f"/uploads/{shard(product)}/{product}.png"),
+    )
+    kept = []
+    removed = []
+    for digest, paths in ((item, kept), (product, kept), (orphan, removed)):
+        for name in (f"{digest}.jpg", f"{digest}_thumb.webp", f"segmented_{digest}_0a1b2c3d.png",
+                     f"segmented_{digest}_0a1b2c3d_medium.webp"):
+            paths.append(write(upload_dir, f"{shard(digest)}/{name}"))
+
+    report = collector.collect()
+
+    assert report.deleted == len(removed)
+    assert all(os.path.exists(path) for path in kept)
+    assert not any(os.path.exists(path) for path in removed)
+
+def test_legacy_names_are_matched_by_path(collector, upload_dir, session_factory):
+    # Старые загрузки: <uuid4>_<имя файла от клиента>, у iOS-клиента это обычно image.jpg
+    legacy, segmented, orphan = (uuid.uuid4().hex for _ in range(3))
+    add(
+        session_factory,
+        WardrobeItem(user_id=1, name="Legacy", image_url=f"/uploads/{legacy}_image.jpg"),
+        WardrobeItem(user_id=1, name="Segmented", image_url=f"/uploads/segmented_{segmented}_image.jpg"),
+    )
+    kept = [
+        write(upload_dir, f"{legacy}_image.jpg"),
+        write(upload_dir, f"{legacy}_image_thumb.webp"),
+        write(upload_dir, f"segmented_{segmented}_image.jpg"),
+        write(upload_dir, f"segmented_{segmented}_image_medium.webp"),
+    ]
+    removed = [write(upload_dir, f"{orphan}_image.jpg"), write(upload_dir, f"{orphan}_image_thumb.webp")]
+
+    collector.collect()
+
+    assert all(os.path.exists(path) for path in kept)
+    assert not any(os.path.exists(path) for path in removed)
+
+def test_removes_stale_temp_files_of_referenced_digest(collector, upload_dir, session_factory):
+    digest = digest_of("item")
+    add(session_factory, WardrobeItem(user_id=1, name="Item", image_url=f"/uploads/{digest}.jpg"))
+    original = write(upload_dir, f"{digest}.jpg")
+    stale = write(upload_dir, f"{digest}.jpg.0123abcd.tmp")
+    in_progress = write(upload_dir, f"{digest}.png.4567ef01.tmp", age_seconds=60)
+
+    collector.collect()
+
+    assert os.path.exists(original)
+    assert not os.path.exists(stale)
+    assert os.path.exists(in_progress)
+
+def test_resumes_from_cursor_across_batches(collector, upload_dir):
+    for i in range(5):
+        digest = digest_of(f"file{i}")
+        write(upload_dir, f"{shard(digest)}/{digest}.jpg")
+
+    reports = [collector.collect(dry_run=True, batch_size=2) for _ in range(3)]
+    restarted = collector.collect(dry_run=True, batch_size=2)
+
+    assert [report.scanned for report in reports] == [2, 2, 1]
+    assert [report.finished for report in reports] == [False, False, True]
+    assert sum(report.deleted for report in reports) == 5
+    assert restarted.scanned == 2
+    assert len(os.listdir(upload_dir)) > 0
+
+def test_recently_seen_upload_survives_old_mtime(collector, upload_dir, session_factory):
+    seen, stale = digest_of("seen"), digest_of("stale")
+    seen_path = write(upload_dir, f"{seen}.jpg")
+    stale_path = write(upload_dir, f"{stale}.jpg")
+    add(
+        session_factory,
+        UploadBlob(digest=seen, path=seen_path, size=10, last_seen_at=datetime.utcnow()),
+        UploadBlob(digest=stale, path=stale_path, size=10, last_seen_at=datetime.utcnow() - timedelta(seconds=OLD)),
+    )
+
+    collector.collect()
+
+    assert os.path.exists(seen_path)
+    assert not os.path.exists(stale_path)
+
+def test_forgets_blobs_only_after_original_is_gone(collector, upload_dir, session_factory):
+    deleted, pending = digest_of("deleted"), digest_of("pending")
+    deleted_path = write(upload_dir, f"{deleted}.jpg")
+    # Старая уменьшенная копия удаляется, а оригинал с тем же хэшем еще в grace-периоде
+    pending_path = write(upload_dir, f"{pending}.jpg", age_seconds=60)
+    pending_thumb = write(upload_dir, f"{pending}_thumb.webp")
+    old_seen = datetime.utcnow() - timedelta(seconds=OLD)
+    add(
+        session_factory,
+        UploadBlob(digest=deleted, path=deleted_path, size=10, last_seen_at=old_seen),
+        UploadBlob(digest=pending, path=pending_path, size=10, last_seen_at=old_seen),
+    )
+
+    collector.collect()
+
+    assert not os.path.exists(pending_thumb)
+    db = session_factory()
+    try:
+        assert {blob.digest for blob in db.query(UploadBlob).all()} == {pending}
+    finally:
+        db.close()
@@ -1,4 +1,7 @@
+import base64
+import io
 import pytest
+from PIL import Image
 from api_test_client import ApiTestClient
 
 @pytest.fixture
@@ -68,6 +71,51 @@ def test_get_wardrobe_items_with_filters(auth_client, test_item):
     for item in data["items"]:
         assert item["type"] == test_item["type"]
 
+def test_create_wardrobe_items_batch(auth_client):
+    items = [
+        {"name": "Blue Jeans", "type": "джинсы", "color": "синий", "season": "демисезон"},
+        {"name": "White Shirt", "type": "рубашка", "color": "белый", "season": "лето"},
+        {"name": "Winter Jacket", "type": "куртка", "color": "черный", "season": "зима"}
+    ]
+
+    response = auth_client.post("/api/wardrobe/items:batch", json_data={"items": items})
+
+    assert response.status_code == 200
+    created = response.json()["items"]
+    assert [item["name"] for item in created] == [item["name"] for item in items]
+    assert all("id" in item for item in created)
+
+    response = auth_client.get("/api/wardrobe/items", params={"size": 10})
+    assert response.json()["total"] == len(items)
+
+def test_create_wardrobe_items_batch_requires_items(auth_client):
+    response = auth_client.post("/api/wardrobe/items:batch", json_data={"items": []})
+
+    assert response.status_code == 400
+
+def test_recognize_wardrobe_items(auth_client):
+    image = Image.new("RGB", (120, 120), (255, 255, 255))
+    image.paste((20, 20, 200), (30, 30, 90, 90))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG")
+    request = {
+        "images": [
+            {"file_data": base64.b64encode(buffer.getvalue()).decode(), "file_name": "jeans.jpg"},
+            {"file_data": base64.b64encode(b"not an image").decode(), "file_name": "broken.jpg"}
+        ],
+        "season": "лето"
+    }
+
+    response = auth_client.post("/api/wardrobe/items:recognize", json_data=request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["items"][0]["season"] == "лето"
+    assert data["items"][0]["image_url"].startswith("/uploads/")
+    assert data["items"][0]["thumbnail_url"].endswith("_thumb.webp")
+    assert data["results"][1]["error"]
+
 def test_update_wardrobe_item(auth_client, test_item):
     update_data = {
         "name": "Updated T-shirt",
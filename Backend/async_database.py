@@ -0,0 +1,54 @@
+from functools import lru_cache
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from Backend.config import get_settings
+from Backend.database import sqlite_pragmas, use_sqlite_pragmas
+
+# Асинхронные драйверы для тех же баз, что настроены в database_url (оба есть в requirements.txt)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """Преобразует URL синхронного движка в URL с асинхронным драйвером (sqlite:// -> sqlite+aiosqlite://)."""
+    scheme, separator, rest = database_url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if not separator or dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database URL scheme '{scheme}'")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    """Асинхронный engine создается при первом запросе, чтобы импорт модуля не зависел от драйвера."""
+    settings = get_settings()
+    async_url = to_async_url(settings.database_url)
+    # Та же база, что и у синхронного engine: схема создается и мигрируется через Backend.database,
+    # а асинхронный слой используется эндпоинтами, которые только читают
+    engine = create_async_engine(async_url)
+    if async_url.startswith("sqlite"):
+        use_sqlite_pragmas(engine.sync_engine, sqlite_pragmas(settings))
+    return engine
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    # expire_on_commit=False: после commit атрибуты не перечитываются лениво, а ленивой загрузки
+    # в AsyncSession нет - связи нужно подгружать явно через selectinload
+    return async_sessionmaker(get_async_engine(), class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+        get_async_sessionmaker.cache_clear()
+        get_async_engine.cache_clear()
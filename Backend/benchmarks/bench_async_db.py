@@ -0,0 +1,134 @@
+"""Пропускная способность чтения страницы гардероба: синхронный путь против асинхронного.
+
+Синхронный эндпоинт (def + get_db + WardrobeService) выполняется в threadpool Starlette, поэтому число
+одновременно обрабатываемых запросов ограничено его размером (--threadpool-size, по умолчанию 40 как в
+anyio). Асинхронный (async def + get_async_db + AsyncWardrobeService) ждет БД как корутина.
+--db-latency-ms добавляет задержку к каждому SQL-запросу в том потоке, где он выполняется, и имитирует
+БД по сети.
+
+Запуск из корня репозитория:
+    python -m Backend.benchmarks.bench_async_db --requests 1000 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+BENCH_DIR = tempfile.mkdtemp(prefix="clothify-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}"
+
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from Backend.async_database import dispose_async_engine, get_async_engine, get_async_db
+from Backend.database import SessionLocal, create_tables, engine, get_db
+from Backend.models.domain import User, WardrobeItem
+from Backend.services.wardrobe_service import AsyncWardrobeService, WardrobeService
+
+PAGE_SIZE = 20
+
+
+def build_app(user_id: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_items(db: Session = Depends(get_db)):
+        return WardrobeService(db).get_items(user_id, size=PAGE_SIZE)
+
+    @app.get("/async")
+    async def async_items(db: AsyncSession = Depends(get_async_db)):
+        return await AsyncWardrobeService(db).get_items(user_id, size=PAGE_SIZE)
+
+    return app
+
+
+def seed(items: int) -> int:
+    create_tables()
+    db = SessionLocal()
+    try:
+        user = User(email="bench@example.com", name="Bench", password_hash="-")
+        db.add(user)
+        db.flush()
+        db.add_all(
+            WardrobeItem(user_id=user.id, name=f"Item {i}", type="футболка", color="белый",
+                         season="лето", image_url=f"/uploads/{i}.jpg")
+            for i in range(items)
+        )
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def add_latency(latency_ms: float) -> None:
+    # Задержку вызывает sqlite3 в потоке, который выполняет запрос: для синхронного engine это поток
+    # threadpool, для aiosqlite - его собственный поток соединения, event loop при этом не блокируется
+    def sleep(_statement):
+        time.sleep(latency_ms / 1000)
+
+    @event.listens_for(engine, "connect")
+    def sync_connect(dbapi_connection, _):
+        dbapi_connection.set_trace_callback(sleep)
+
+    @event.listens_for(get_async_engine().sync_engine, "connect")
+    def async_connect(dbapi_connection, _):
+        dbapi_connection.run_async(lambda connection: connection.set_trace_callback(sleep))
+
+
+async def run(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - started)
+
+
+async def bench(app: FastAPI, total: int, levels, threadpool_size: int) -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_size
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Прогрев: соединения пулов открываются до замеров
+        await run(client, "/sync", 20, 10)
+        await run(client, "/async", 20, 10)
+
+        print(f"{'in-flight':>10} {'sync req/s':>12} {'async req/s':>12}")
+        for concurrency in levels:
+            sync = await run(client, "/sync", total, concurrency)
+            async_ = await run(client, "/async", total, concurrency)
+            print(f"{concurrency:>10} {sync:>12.0f} {async_:>12.0f}")
+
+    await dispose_async_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", default="1,16,64,256")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    parser.add_argument("--threadpool-size", type=int, default=40)
+    args = parser.parse_args()
+
+    user_id = seed(args.items)
+    if args.db_latency_ms > 0:
+        add_latency(args.db_latency_ms)
+
+    print(f"{args.requests} requests, page of {PAGE_SIZE} out of {args.items} items, "
+          f"DB latency {args.db_latency_ms}ms per query, threadpool {args.threadpool_size}")
+    levels = [int(value) for value in args.concurrency.split(",")]
+    asyncio.run(bench(build_app(user_id), args.requests, levels, args.threadpool_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Пропускная способность аутентифицированного запроса в зависимости от числа одновременных запросов.
+
+Сравнивает прежний get_current_user, который ходил в БД прямо в event loop, с текущим, который читает
+пользователя через асинхронную сессию. Кэш пользователей отключается, чтобы каждый запрос доходил до БД.
+--db-latency-ms добавляет задержку к каждому SQL-запросу в том потоке, где он выполняется, и имитирует
+БД по сети.
+
+Запуск из корня репозитория:
+    python -m Backend.benchmarks.bench_auth_concurrency --requests 400 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+BENCH_DIR = tempfile.mkdtemp(prefix="clothify-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}"
+os.environ["AUTH_USER_CACHE_TTL_SECONDS"] = "0"
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from jose import jwt
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from Backend.async_database import dispose_async_engine, get_async_engine
+from Backend.database import SQLALCHEMY_DATABASE_URL, SessionLocal, create_tables, sqlite_pragmas, use_sqlite_pragmas
+from Backend.models.domain import User
+from Backend.models.schemas import UserResponse
+from Backend.repositories.user_repository import UserRepository
+from Backend.utils.security import create_access_token, get_current_user, oauth2_scheme, settings
+
+
+def build_legacy_engine(pool_size: int, max_overflow: int):
+    # Свой engine с явными размерами пула, чтобы знать, сколько соединений может занять прежняя версия
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False},
+                           pool_size=pool_size, max_overflow=max_overflow)
+    use_sqlite_pragmas(engine, sqlite_pragmas(settings))
+    return engine
+
+
+def build_app(legacy_engine) -> FastAPI:
+    app = FastAPI()
+    LegacySession = sessionmaker(autocommit=False, autoflush=False, bind=legacy_engine)
+
+    def get_legacy_db():
+        db = LegacySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def legacy_get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_legacy_db)):
+        # Прежняя реализация: синхронный запрос к БД прямо в корутине
+        email = jwt.decode(token, settings.secret_key, algorithms=["HS256"]).get("sub")
+        user = UserRepository(db).get_by_email(email)
+        if user is None:
+            raise HTTPException(status_code=401)
+        return UserResponse.model_validate(user)
+
+    @app.get("/legacy")
+    async def legacy(current_user: UserResponse = Depends(legacy_get_current_user)):
+        return {"id": current_user.id}
+
+    @app.get("/current")
+    async def current(current_user: UserResponse = Depends(get_current_user)):
+        return {"id": current_user.id}
+
+    return app
+
+
+def create_user() -> str:
+    create_tables()
+    db = SessionLocal()
+    try:
+        db.add(User(email="bench@example.com", name="Bench", password_hash="-"))
+        db.commit()
+    finally:
+        db.close()
+    return create_access_token({"sub": "bench@example.com"})
+
+
+async def run(app: FastAPI, path: str, token: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path, headers=headers)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+async def bench(app: FastAPI, token: str, total: int, levels, pool_capacity: int) -> None:
+    print(f"{'in-flight':>10} {'legacy req/s':>14} {'current req/s':>14}")
+    for concurrency in levels:
+        current = await run(app, "/current", token, total, concurrency)
+        if concurrency < pool_capacity:
+            legacy = f"{await run(app, '/legacy', token, total, concurrency):.0f}"
+        else:
+            # Прежняя версия ждет свободное соединение пула прямо в event loop, и соединения, которые
+            # держат другие запросы, некому вернуть - запросы висят до pool_timeout
+            legacy = "deadlock"
+        print(f"{concurrency:>10} {legacy:>14} {current:>14.0f}")
+
+    # Соединения aiosqlite привязаны к event loop и держат свои потоки: закрываем их до выхода
+    await dispose_async_engine()
+
+
+def add_latency(legacy_engine, latency_ms: float) -> None:
+    # Задержку вызывает sqlite3 в потоке, который выполняет запрос; aiosqlite выполняет запросы
+    # в своем потоке, поэтому у текущей версии она не блокирует event loop
+    def sleep(_statement):
+        time.sleep(latency_ms / 1000)
+
+    @event.listens_for(legacy_engine, "connect")
+    def sync_connect(dbapi_connection, _):
+        dbapi_connection.set_trace_callback(sleep)
+
+    @event.listens_for(get_async_engine().sync_engine, "connect")
+    def async_connect(dbapi_connection, _):
+        dbapi_connection.run_async(lambda connection: connection.set_trace_callback(sleep))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    parser.add_argument("--pool-size", type=int, default=5, help="пул синхронного engine прежней версии")
+    parser.add_argument("--max-overflow", type=int, default=10)
+    args = parser.parse_args()
+
+    token = create_user()
+    legacy_engine = build_legacy_engine(args.pool_size, args.max_overflow)
+    if args.db_latency_ms > 0:
+        add_latency(legacy_engine, args.db_latency_ms)
+
+    print(f"{args.requests} requests, DB latency {args.db_latency_ms}ms per query, "
+          f"legacy pool {args.pool_size}+{args.max_overflow}")
+    levels = [int(value) for value in args.concurrency.split(",")]
+    asyncio.run(bench(build_app(legacy_engine), token, args.requests, levels, args.pool_size + args.max_overflow))
+    legacy_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
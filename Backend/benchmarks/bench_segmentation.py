@@ -0,0 +1,87 @@
+"""Сравнение старого попиксельного удаления фона с векторизованным и с режимом multiscale на изображениях из testnetw.
+
+Запуск из корня репозитория:
+    python -m Backend.benchmarks.bench_segmentation --max-side 600 --limit 5
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+from Backend.services.segmentation import remove_background, remove_background_multiscale
+
+TESTNETW_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "testnetw")
+
+
+def legacy_remove_background(original_image: Image.Image) -> Image.Image:
+    # Прежняя реализация из MLService.segment_image
+    if original_image.mode != 'RGBA':
+        original_image = original_image.convert('RGBA')
+
+    background_color = original_image.getpixel((0, 0))
+    transparent_image = Image.new("RGBA", original_image.size, (0, 0, 0, 0))
+
+    for y in range(original_image.size[1]):
+        for x in range(original_image.size[0]):
+            current_color = original_image.getpixel((x, y))
+            diff = sum(abs(a-b) for a, b in zip(current_color, background_color))
+            if diff > 50:
+                transparent_image.putpixel((x, y), current_color)
+
+    return transparent_image
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=TESTNETW_DIR)
+    parser.add_argument("--limit", type=int, default=0, help="сколько изображений взять (0 - все)")
+    parser.add_argument("--max-side", type=int, default=600,
+                        help="уменьшить изображения для сравнения со старой реализацией (0 - полный размер)")
+    args = parser.parse_args()
+
+    files = sorted(f for f in os.listdir(args.dir) if not f.startswith("."))
+    if args.limit:
+        files = files[:args.limit]
+
+    total_legacy = total_vectorized = total_full = total_multiscale = 0.0
+    for file in files:
+        image = Image.open(os.path.join(args.dir, file))
+        image.load()
+        full_size = image.size
+
+        _, full_time = timed(remove_background, image)
+        _, multiscale_time = timed(remove_background_multiscale, image)
+        total_full += full_time
+        total_multiscale += multiscale_time
+
+        if args.max_side:
+            image = image.copy()
+            image.thumbnail((args.max_side, args.max_side))
+
+        legacy, legacy_time = timed(legacy_remove_background, image)
+        vectorized, vectorized_time = timed(remove_background, image)
+        total_legacy += legacy_time
+        total_vectorized += vectorized_time
+
+        identical = np.array_equal(np.asarray(legacy), np.asarray(vectorized))
+        print(f"{file}: {image.size[0]}x{image.size[1]} legacy {legacy_time:.3f}s, "
+              f"numpy {vectorized_time * 1000:.1f}ms (x{legacy_time / max(vectorized_time, 1e-9):.0f}), "
+              f"identical={identical}; full {full_size[0]}x{full_size[1]} numpy {full_time * 1000:.1f}ms, "
+              f"multiscale {multiscale_time * 1000:.1f}ms")
+
+    if files:
+        print(f"\nTotal for {len(files)} images: legacy {total_legacy:.2f}s, numpy {total_vectorized:.3f}s, "
+              f"speedup x{total_legacy / max(total_vectorized, 1e-9):.0f}; "
+              f"at full resolution numpy {total_full:.2f}s, multiscale {total_multiscale:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Пропускная способность записи в SQLite: прежний engine против профиля соединения из настроек.
+
+Несколько потоков-писателей создают вещи гардероба по одной через WardrobeRepository.create_item
+(один commit на вещь, как в API), параллельно потоки-читатели листают страницы гардероба. Каждый
+профиль работает на своем новом файле базы. "before" - engine без PRAGMA, как было раньше
+(rollback journal, synchronous=FULL), "after" - PRAGMA из sqlite_* настроек.
+
+Запуск из корня репозитория:
+    python -m Backend.benchmarks.bench_sqlite_writes --writers 4 --readers 4 --writes 500
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from Backend.config import get_settings
+from Backend.database import Base, sqlite_pragmas, use_sqlite_pragmas
+from Backend.models.domain import User
+from Backend.repositories.wardrobe_repository import WardrobeRepository
+
+
+def build_sessionmaker(path: str, pragmas: dict, pool_size: int):
+    # Соединение на каждый поток, чтобы потоки ждали базу, а не пул
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=pool_size)
+    if pragmas:
+        use_sqlite_pragmas(engine, pragmas)
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def run_profile(path: str, pragmas: dict, writers: int, readers: int, writes: int):
+    engine, Session = build_sessionmaker(path, pragmas, writers + readers)
+    db = Session()
+    try:
+        user = User(email="bench@example.com", name="Bench", password_hash="-")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+
+    written = [0] * writers
+    reads = [0] * readers
+    errors = [0]
+    errors_lock = threading.Lock()
+    writers_done = threading.Event()
+
+    def writer(index: int):
+        db = Session()
+        repository = WardrobeRepository(db)
+        try:
+            for i in range(writes):
+                try:
+                    repository.create_item(user_id, f"Item {index}-{i}", "футболка", "белый", "лето")
+                    written[index] += 1
+                except OperationalError:
+                    # "database is locked": запись теряется, как потерялся бы запрос к API
+                    db.rollback()
+                    with errors_lock:
+                        errors[0] += 1
+        finally:
+            db.close()
+
+    def reader(index: int):
+        db = Session()
+        repository = WardrobeRepository(db)
+        try:
+            while not writers_done.is_set():
+                try:
+                    repository.get_items(user_id, 0, 20)
+                    repository.count_items(user_id)
+                    db.rollback()
+                    reads[index] += 1
+                except OperationalError:
+                    db.rollback()
+                    with errors_lock:
+                        errors[0] += 1
+        finally:
+            db.close()
+
+    writer_threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    reader_threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    started = time.perf_counter()
+    for thread in writer_threads + reader_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    writers_done.set()
+    for thread in reader_threads:
+        thread.join()
+
+    engine.dispose()
+    return sum(written) / elapsed, sum(reads) / elapsed, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=500, help="вещей на каждого писателя")
+    parser.add_argument("--dir", default=None, help="каталог для файлов базы (по умолчанию временный)")
+    args = parser.parse_args()
+
+    bench_dir = args.dir or tempfile.mkdtemp(prefix="clothify-bench-")
+    profiles = {
+        "before": {},
+        "after": sqlite_pragmas(get_settings()),
+    }
+
+    print(f"{args.writers} writers x {args.writes} commits, {args.readers} readers, files in {bench_dir}")
+    print(f"{'profile':>8} {'writes/s':>10} {'reads/s':>10} {'errors':>8}")
+    for name, pragmas in profiles.items():
+        path = os.path.join(bench_dir, f"{name}.db")
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        writes_per_second, reads_per_second, errors = run_profile(
+            path, pragmas, args.writers, args.readers, args.writes
+        )
+        print(f"{name:>8} {writes_per_second:>10.0f} {reads_per_second:>10.0f} {errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
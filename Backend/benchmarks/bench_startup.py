@@ -0,0 +1,72 @@
+"""Замер стоимости холодного старта API: время импорта Backend.main, пиковая память и самые дорогие модули.
+
+Каждый прогон выполняется в отдельном процессе, чтобы кэш модулей не искажал результат.
+Запуск из корня репозитория:
+    python -m Backend.benchmarks.bench_startup --runs 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MEASURE_SCRIPT = """
+import resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(f"RESULT {{elapsed}} {{rss_kb}} {{'tensorflow' in sys.modules}}")
+"""
+
+
+def measure(module: str):
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE_SCRIPT.format(module=module)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    _, elapsed, rss_kb, tf_loaded = re.search(r"^RESULT .*$", output, re.M).group(0).split()
+    return float(elapsed), int(rss_kb) / 1024, tf_loaded == "True"
+
+
+def top_imports(module: str, limit: int):
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    ).stderr
+    rows = {}
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)$", line)
+        # Берем только корневые пакеты (fastapi, numpy, tensorflow...), чтобы не дублировать подмодули
+        if match and "." not in match.group(2):
+            name = match.group(2)
+            rows[name] = max(rows.get(name, 0), int(match.group(1)))
+    return sorted(((cumulative, name) for name, cumulative in rows.items()), reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="Backend.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    results = [measure(args.module) for _ in range(args.runs)]
+    times = [elapsed for elapsed, _, _ in results]
+    rss = [memory for _, memory, _ in results]
+
+    print(f"import {args.module}: median {statistics.median(times) * 1000:.0f}ms, "
+          f"min {min(times) * 1000:.0f}ms, max {max(times) * 1000:.0f}ms over {args.runs} runs")
+    print(f"peak RSS: median {statistics.median(rss):.0f}MB")
+    print(f"tensorflow imported at startup: {results[0][2]}")
+
+    print(f"\nTop {args.top} root packages by cumulative import time:")
+    for cumulative_us, name in top_imports(args.module, args.top):
+        print(f"  {cumulative_us / 1000:8.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Пакетное определение цвета одежды для каталога изображений или списка файлов.
+
+Файлы обрабатываются параллельно в пуле процессов, результаты пишутся построчно в JSONL или CSV
+по мере готовности. Состояние (mtime, размер, sha256, версия алгоритма и результат) сохраняется
+в файле --state, поэтому при повторном запуске неизмененные файлы не обрабатываются заново, а после
+смены алгоритма цвета или --top-k пересчитываются все.
+
+Запуск из корня репозитория:
+    python -m Backend.color_batch Backend/testnetw --output colors.jsonl
+    python -m Backend.color_batch files.txt --output colors.csv --workers 8
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from PIL import Image
+
+from Backend import reqcol1 as reqcol
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+CSV_FIELDS = ["path", "color", "r", "g", "b", "colors", "sha256", "cached", "error"]
+
+
+def collect_paths(source):
+    # Источник - каталог (обходится рекурсивно) или манифест: по пути в строке либо JSONL с полем "path"
+    if os.path.isdir(source):
+        paths = []
+        for root, dirs, files in os.walk(source):
+            for file in sorted(files):
+                if file.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.append(os.path.join(root, file))
+        return paths
+
+    paths = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            paths.append(json.loads(line)["path"] if line.startswith("{") else line)
+    return paths
+
+
+def algorithm_key(top_k):
+    # Результат зависит от версии алгоритма и числа цветов: при их смене сохраненные строки не годятся
+    return f"{reqcol.COLOR_ALGORITHM_VERSION}:k={top_k}"
+
+
+def analyze(task):
+    path, known_sha256, top_k = task
+    row = {"path": path}
+    try:
+        stat = os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        row.update(mtime=stat.st_mtime, size=stat.st_size, sha256=hashlib.sha256(data).hexdigest())
+
+        # Файл трогали, но содержимое не изменилось - пересчитывать нечего
+        if known_sha256 and row["sha256"] == known_sha256:
+            row["unchanged"] = True
+            return row
+
+        image = Image.open(io.BytesIO(data))
+        image.draft("RGB", (80, 80))
+        thumbnail = image.convert("RGB").resize((80, 80))
+        colors = reqcol.detect_dominant_colors(thumbnail, k=top_k)
+        row["color"], rgb, _ = colors[0] if colors else ("Неопределенный", (0, 0, 0), 0.0)
+        row["rgb"] = list(rgb)
+        row["colors"] = [{"name": name, "rgb": list(rgb), "coverage": round(coverage, 3)} for name, rgb, coverage in colors]
+    except Exception as e:
+        row["error"] = str(e)
+    return row
+
+
+def load_state(path):
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(path, state):
+    if not path:
+        return
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+class RowWriter:
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.output_format = output_format
+        if output_format == "csv":
+            self.writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self.writer.writeheader()
+
+    def write(self, row):
+        if self.output_format == "csv":
+            rgb = row.get("rgb") or [None, None, None]
+            self.writer.writerow(dict(
+                row, r=rgb[0], g=rgb[1], b=rgb[2],
+                colors=json.dumps(row.get("colors", []), ensure_ascii=False)
+            ))
+        else:
+            self.stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        # Строки отдаются сразу, чтобы результаты можно было читать во время обработки
+        self.stream.flush()
+
+
+def run(source, output, output_format, workers, state_path, progress_every, top_k=3):
+    paths = collect_paths(source)
+    algorithm = algorithm_key(top_k)
+    state = {
+        path: entry for path, entry in load_state(state_path).items()
+        if entry.get("algorithm") == algorithm
+    }
+
+    tasks = []
+    cached_rows = []
+    for path in paths:
+        previous = state.get(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            previous = None
+            stat = None
+        if previous and stat and previous["mtime"] == stat.st_mtime and previous["size"] == stat.st_size:
+            cached_rows.append(previous["row"])
+        else:
+            tasks.append((path, previous["row"]["sha256"] if previous else None, top_k))
+
+    stream = sys.stdout if output == "-" else open(output, "w", encoding="utf-8", newline="")
+    writer = RowWriter(stream, output_format)
+    started = time.perf_counter()
+    processed = unchanged = errors = 0
+
+    try:
+        for row in cached_rows:
+            writer.write(dict(row, cached=True))
+
+        with Pool(processes=workers) as pool:
+            for row in pool.imap_unordered(analyze, tasks, chunksize=4):
+                if row.pop("unchanged", False):
+                    result = dict(state[row["path"]]["row"], cached=True)
+                    unchanged += 1
+                else:
+                    result = {key: value for key, value in row.items() if key not in ("mtime", "size")}
+                    if "error" in row:
+                        errors += 1
+                    else:
+                        processed += 1
+
+                writer.write(result)
+                if "error" not in row:
+                    state[row["path"]] = {
+                        "mtime": row["mtime"],
+                        "size": row["size"],
+                        "algorithm": algorithm,
+                        "row": {key: value for key, value in result.items() if key != "cached"},
+                    }
+
+                done = processed + unchanged + errors
+                if progress_every and done and done % progress_every == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"{done}/{len(tasks)} images, {done / elapsed:.1f} images/sec", file=sys.stderr)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        save_state(state_path, state)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Done: {processed} analyzed, {len(cached_rows) + unchanged} skipped as unchanged, {errors} errors "
+        f"in {elapsed:.2f}s ({processed / elapsed if elapsed else 0:.1f} images/sec, {workers} workers)",
+        file=sys.stderr
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="каталог с изображениями или манифест со списком файлов")
+    parser.add_argument("--output", default="-", help="файл .jsonl или .csv; '-' - stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="по умолчанию определяется по расширению --output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--state", default=".color_batch_state.json",
+                        help="файл с mtime/хэшами уже обработанных изображений; пустая строка - не сохранять")
+    parser.add_argument("--progress-every", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=3, help="сколько основных цветов искать в изображении")
+    args = parser.parse_args()
+
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    run(args.source, args.output, output_format, args.workers, args.state, args.progress_every, args.top_k)
+
+
+if __name__ == "__main__":
+    main()
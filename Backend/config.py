@@ -5,11 +5,61 @@ import os
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./clothify.db"
+    # PRAGMA для каждого нового соединения с SQLite; journal_mode=delete и synchronous=full - прежнее поведение
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # 0 - без mmap
+    sqlite_cache_size: int = -64 * 1024  # отрицательное значение - в КиБ, положительное - в страницах
+    sqlite_temp_store: str = "memory"  # default, file или memory
     secret_key: str = "your-secret-key"
     token_expire_minutes: int = 60 * 24 * 7  # 7 days
     api_base_url: str = "http://localhost:8000"
     environment: str = "development"
+    metrics_token: str = ""  # токен для /metrics (заголовок X-Metrics-Token), пусто - эндпоинт отключен
     algorithm: str = "HS256"
+    auth_user_cache_size: int = 10000
+    auth_user_cache_ttl_seconds: int = 60  # 0 - не кэшировать пользователей
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+    ml_model_path: str = "v80_4.5fashion_classifier.h5"
+    ml_backend: str = "keras"  # keras или tflite (с откатом на Keras-модель из ml_model_path)
+    ml_tflite_model_path: str = "v80_4.5fashion_classifier.tflite"
+    ml_num_threads: int = 0  # 0 - число потоков по умолчанию
+    ml_warm_up_on_startup: bool = True
+    ml_batch_window_ms: float = 10.0
+    ml_batch_max_size: int = 16
+    ml_batch_queue_depth: int = 128
+    ml_batch_timeout_seconds: float = 30.0
+    ml_inference_workers: int = 0  # 0 - потоки в процессе API, >0 - отдельные процессы с моделью
+    ml_inference_threads: int = 4
+    ml_inference_max_pending: int = 32
+    ml_max_upload_bytes: int = 20 * 1024 * 1024
+    ml_recognize_batch_max_images: int = 50
+    ml_recognize_batch_decode_threads: int = 4
+    ml_job_workers: int = 2
+    ml_job_queue_size: int = 256
+    ml_job_ttl_seconds: int = 3600
+    ml_result_cache_size: int = 1024
+    ml_result_cache_ttl_seconds: int = 7 * 24 * 3600
+    ml_result_cache_path: str = ""  # путь к SQLite-файлу постоянного уровня кэша, пусто - только память
+    ml_result_cache_persistent_size: int = 100000
+    color_lut_path: str = ""  # таблица цветов (python -m Backend.reqcol1 --build-lut), пусто - ~/.cache/clothify/color_lut.npy
+    color_top_k: int = 3
+    color_time_budget_ms: float = 20.0
+    segment_tolerance: int = 50
+    segment_background_sampling: str = "corner"  # corner, corners или border (только для режима full)
+    segment_mode: str = "multiscale"  # full - попиксельно в полном размере, multiscale - маска на уменьшенной копии
+    segment_mask_size: int = 256
+    segment_morphology_size: int = 3
+    wardrobe_batch_max_items: int = 100
+    upload_derivative_format: str = "webp"  # webp или jpeg
+    upload_derivatives_on_upload: bool = True  # иначе уменьшенные копии создаются при первом запросе
+    upload_gc_enabled: bool = True
+    upload_gc_interval_seconds: int = 3600
+    upload_gc_grace_seconds: int = 24 * 3600
+    upload_gc_batch_size: int = 1000
 
     class Config:
         env_file = ".env"
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from typing import Generator
@@ -11,9 +11,43 @@ settings = get_settings()
 
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
+
+def sqlite_pragmas(settings) -> dict:
+    """Профиль соединения SQLite из настроек, в порядке применения."""
+    return {
+        # WAL: читатели не блокируют писателя, commit пишет в журнал без fsync основного файла
+        "journal_mode": settings.sqlite_journal_mode,
+        # NORMAL в режиме WAL теряет при сбое питания только последние транзакции, но не портит базу
+        "synchronous": settings.sqlite_synchronous,
+        # Вместо мгновенного "database is locked" ждем, пока другой писатель освободит базу
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+        "temp_store": settings.sqlite_temp_store,
+    }
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict) -> None:
+    # Через cursor(), чтобы одинаково работать и с sqlite3, и с адаптером aiosqlite в асинхронном engine
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def use_sqlite_pragmas(sync_engine, pragmas: dict) -> None:
+    """Применяет PRAGMA к каждому новому соединению engine (для AsyncEngine передается его sync_engine)."""
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
 # Для SQLite
 if SQLALCHEMY_DATABASE_URL.startswith('sqlite'):
     engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+    use_sqlite_pragmas(engine, sqlite_pragmas(settings))
 else:
     engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
@@ -1,13 +1,26 @@
-from fastapi import FastAPI, Depends
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import FastAPI, Depends, Header, HTTPException, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 import os
 
 # Используем абсолютные импорты
+from Backend.async_database import dispose_async_engine
 from Backend.database import create_tables, SessionLocal, db_exists, update_db_structure
 from Backend.repositories.colortype_repository import ColorTypeRepository
 from Backend.repositories.product_repository import ProductRepository
+from Backend.services.batching import shutdown_classifier_batcher
+from Backend.services.upload_static import UploadsStaticFiles
+from Backend.services.inference_pool import get_inference_pool, shutdown_inference_pool
+from Backend.services.jobs import get_job_queue, shutdown_job_queue
+from Backend.services.password_hasher import shutdown_password_hasher
+from Backend.services.upload_gc import run_upload_gc_periodically
+from Backend.utils import metrics
+from Backend.config import get_settings
 from Backend.api import auth, colortype, users, wardrobe, outfit, ml, products
 
 app = FastAPI(title="Clothify API")
@@ -21,9 +34,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Монтируем директорию uploads для доступа к загруженным файлам
+# Монтируем директорию uploads для доступа к загруженным файлам: файлы с хэшем в имени кэшируются
+# клиентом навсегда, уменьшенные копии (<имя>_thumb.webp) создаются при первом запросе
 os.makedirs("uploads", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", UploadsStaticFiles(directory="uploads"), name="uploads")
 
 # Подключаем роутеры API
 app.include_router(auth.router)
@@ -61,6 +75,34 @@ async def startup_event():
     else:
         print("Using existing database")
 
+    # Прогреваем классификатор в фоне: сервер начинает отвечать сразу, а первый запрос
+    # к /api/ml не ждет загрузки модели, если прогрев успел завершиться
+    pool = get_inference_pool()
+    if get_settings().ml_warm_up_on_startup:
+        app.state.ml_warm_up_task = asyncio.create_task(pool.warm_up())
+
+    # Воркеры фоновых ML-задач (/api/ml/jobs)
+    get_job_queue()
+
+    # Периодически удаляем из uploads файлы, которые так и не попали в гардероб
+    if get_settings().upload_gc_enabled:
+        app.state.upload_gc_task = asyncio.create_task(run_upload_gc_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    upload_gc_task = getattr(app.state, "upload_gc_task", None)
+    if upload_gc_task:
+        upload_gc_task.cancel()
+
+    # Очередь заданий дожидается запущенных, а не начатые помечает неудавшимися; пул инференса
+    # дорабатывает все принятые запросы. Батчер, которым они пользуются, останавливаем последним
+    shutdown_job_queue()
+    shutdown_inference_pool()
+    shutdown_classifier_batcher()
+    shutdown_password_hasher()
+    await dispose_async_engine()
+
 
 @app.get("/")
 def read_root():
@@ -72,6 +114,23 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/ready")
+def readiness_check():
+    # ML считается готовым, когда модель загружена; до этого /api/ml отвечает медленнее
+    ml_ready = get_inference_pool().is_ready
+    content = {"status": "ready" if ml_ready else "warming_up", "ml_ready": ml_ready}
+    return JSONResponse(content, status_code=200 if ml_ready else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics(x_metrics_token: Optional[str] = Header(default=None)):
+    # Внутренние очереди, кэши и счетчики авторизации отдаем только сборщику метрик с токеном
+    metrics_token = get_settings().metrics_token
+    if not metrics_token or not secrets.compare_digest(x_metrics_token or "", metrics_token):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return metrics.snapshot()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("Backend.main:app", host="0.0.0.0", port=8000, reload=True)
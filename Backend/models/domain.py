@@ -101,4 +101,14 @@ class Product(Base):
     store = Column(String, index=True)
     image_url = Column(String)
     description = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class UploadBlob(Base):
+    __tablename__ = "upload_blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    digest = Column(String, unique=True, index=True)
+    path = Column(String)
+    size = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
@@ -1,7 +1,9 @@
 from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, computed_field
 from datetime import datetime
 
+from Backend.utils.derivative_names import derivative_url
+
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -103,10 +105,24 @@ class WardrobeItemResponse(WardrobeItemBase):
     user_id: int
     created_at: datetime
 
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        # Для сетки гардероба на телефоне достаточно маленькой копии вместо оригинала
+        return derivative_url(self.image_url, "thumb")
+
     class Config:
         from_attributes = True
 
 
+class WardrobeItemsBatchCreate(BaseModel):
+    items: List[WardrobeItemCreate]
+
+
+class WardrobeItemsBatchResponse(BaseModel):
+    items: List[WardrobeItemResponse]
+
+
 class WardrobeItemsPage(BaseModel):
     items: List[WardrobeItemResponse]
     total: int
@@ -188,6 +204,12 @@ class MLImageUpload(BaseModel):
     file_name: str
 
 
+class DetectedColor(BaseModel):
+    name: str
+    rgb: List[int]
+    coverage: float
+
+
 class DetectedClothing(BaseModel):
     type: str
     color: str
@@ -196,16 +218,52 @@ class DetectedClothing(BaseModel):
     y: int
     width: int
     height: int
+    colors: List[DetectedColor] = []
 
 
 class RecognizeResponse(BaseModel):
     detected_items: List[DetectedClothing]
 
 
+class MLBatchUpload(BaseModel):
+    images: List[MLImageUpload]
+
+
+class BatchRecognizeResult(BaseModel):
+    index: int
+    file_name: str
+    image_url: Optional[str] = None
+    detected_items: List[DetectedClothing] = []
+    error: Optional[str] = None
+
+
+class BatchRecognizeResponse(BaseModel):
+    results: List[BatchRecognizeResult]
+
+
+class RecognizeIngestRequest(MLBatchUpload):
+    season: str
+
+
+class RecognizeIngestResponse(BaseModel):
+    items: List[WardrobeItemResponse]
+    results: List[BatchRecognizeResult]
+
+
 class SegmentationResponse(BaseModel):
     segmented_image_url: str
 
 
+class MLJobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
 class ProductBase(BaseModel):
     name: str
     type: str
@@ -1,9 +1,23 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, func, select
 
 from Backend.models.domain import Outfit, OutfitItem, WardrobeItem
 
+
+def _filter_outfits(query, user_id: int, filters: Optional[Dict[str, Any]]):
+    # Общие условия для Query синхронного репозитория и Select асинхронного
+    query = query.filter(Outfit.user_id == user_id)
+
+    if filters:
+        if filters.get("occasion"):
+            query = query.filter(Outfit.occasion == filters["occasion"])
+        if filters.get("is_favorite") is not None:
+            query = query.filter(Outfit.is_favorite == filters["is_favorite"])
+
+    return query
+
 class OutfitRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -31,26 +45,11 @@ class OutfitRepository:
         return outfit_item
 
     def get_outfits(self, user_id: int, skip: int = 0, limit: int = 10, filters: Dict[str, Any] = None) -> List[Outfit]:
-        query = self.db.query(Outfit).filter(Outfit.user_id == user_id)
-
-        if filters:
-            if filters.get("occasion"):
-                query = query.filter(Outfit.occasion == filters["occasion"])
-            if filters.get("is_favorite") is not None:
-                query = query.filter(Outfit.is_favorite == filters["is_favorite"])
-
+        query = _filter_outfits(self.db.query(Outfit), user_id, filters)
         return query.order_by(desc(Outfit.created_at)).offset(skip).limit(limit).all()
 
     def count_outfits(self, user_id: int, filters: Dict[str, Any] = None) -> int:
-        query = self.db.query(Outfit).filter(Outfit.user_id == user_id)
-
-        if filters:
-            if filters.get("occasion"):
-                query = query.filter(Outfit.occasion == filters["occasion"])
-            if filters.get("is_favorite") is not None:
-                query = query.filter(Outfit.is_favorite == filters["is_favorite"])
-
-        return query.count()
+        return _filter_outfits(self.db.query(Outfit), user_id, filters).count()
 
     def get_outfit_by_id(self, outfit_id: int, user_id: int) -> Optional[Outfit]:
         return self.db.query(Outfit).filter(
@@ -88,4 +87,33 @@ class OutfitRepository:
         return self.db.query(WardrobeItem).filter(
             WardrobeItem.user_id == user_id,
             WardrobeItem.type == item_type
-        ).all()
\ No newline at end of file
+        ).all()
+
+
+class AsyncOutfitRepository:
+    """Чтение образов через AsyncSession для эндпоинтов, которые работают как корутины.
+
+    В AsyncSession нет ленивой загрузки, поэтому предметы образа и вещи гардероба подгружаются
+    сразу через selectinload - по одному запросу на связь для всей страницы.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _with_items(query):
+        return query.options(selectinload(Outfit.items).selectinload(OutfitItem.wardrobe_item))
+
+    async def get_outfits(self, user_id: int, skip: int = 0, limit: int = 10,
+                          filters: Dict[str, Any] = None) -> List[Outfit]:
+        query = self._with_items(_filter_outfits(select(Outfit), user_id, filters))
+        result = await self.db.scalars(query.order_by(desc(Outfit.created_at)).offset(skip).limit(limit))
+        return list(result)
+
+    async def count_outfits(self, user_id: int, filters: Dict[str, Any] = None) -> int:
+        return await self.db.scalar(_filter_outfits(select(func.count()).select_from(Outfit), user_id, filters))
+
+    async def get_outfit_by_id(self, outfit_id: int, user_id: int) -> Optional[Outfit]:
+        return await self.db.scalar(
+            self._with_items(select(Outfit).filter(Outfit.id == outfit_id, Outfit.user_id == user_id))
+        )
@@ -1,9 +1,27 @@
 from typing import List, Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, func, select
 
 from Backend.models.domain import Product
 
+
+def _filter_products(query, filters: Optional[Dict[str, Any]]):
+    # Общие условия для Query синхронного репозитория и Select асинхронного
+    if filters:
+        if filters.get("type"):
+            query = query.filter(Product.type == filters["type"])
+        if filters.get("color"):
+            query = query.filter(Product.color == filters["color"])
+        if filters.get("store"):
+            query = query.filter(Product.store == filters["store"])
+        if filters.get("price_min") is not None:
+            query = query.filter(Product.price >= filters["price_min"])
+        if filters.get("price_max") is not None:
+            query = query.filter(Product.price <= filters["price_max"])
+
+    return query
+
 class ProductRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -25,38 +43,11 @@ class ProductRepository:
         return product
 
     def get_products(self, skip: int = 0, limit: int = 10, filters: Dict[str, Any] = None) -> List[Product]:
-        query = self.db.query(Product)
-
-        if filters:
-            if filters.get("type"):
-                query = query.filter(Product.type == filters["type"])
-            if filters.get("color"):
-                query = query.filter(Product.color == filters["color"])
-            if filters.get("store"):
-                query = query.filter(Product.store == filters["store"])
-            if filters.get("price_min") is not None:
-                query = query.filter(Product.price >= filters["price_min"])
-            if filters.get("price_max") is not None:
-                query = query.filter(Product.price <= filters["price_max"])
-
+        query = _filter_products(self.db.query(Product), filters)
         return query.order_by(desc(Product.created_at)).offset(skip).limit(limit).all()
 
     def count_products(self, filters: Dict[str, Any] = None) -> int:
-        query = self.db.query(Product)
-
-        if filters:
-            if filters.get("type"):
-                query = query.filter(Product.type == filters["type"])
-            if filters.get("color"):
-                query = query.filter(Product.color == filters["color"])
-            if filters.get("store"):
-                query = query.filter(Product.store == filters["store"])
-            if filters.get("price_min") is not None:
-                query = query.filter(Product.price >= filters["price_min"])
-            if filters.get("price_max") is not None:
-                query = query.filter(Product.price <= filters["price_max"])
-
-        return query.count()
+        return _filter_products(self.db.query(Product), filters).count()
 
     def get_product_by_id(self, product_id: int) -> Optional[Product]:
         return self.db.query(Product).filter(Product.id == product_id).first()
@@ -168,4 +159,28 @@ class ProductRepository:
             ]
 
             for product_data in mock_products:
-                self.create_product(**product_data)
\ No newline at end of file
+                self.create_product(**product_data)
+
+
+class AsyncProductRepository:
+    """Чтение каталога товаров через AsyncSession для эндпоинтов, которые работают как корутины."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_products(self, skip: int = 0, limit: int = 10, filters: Dict[str, Any] = None) -> List[Product]:
+        query = _filter_products(select(Product), filters)
+        result = await self.db.scalars(query.order_by(desc(Product.created_at)).offset(skip).limit(limit))
+        return list(result)
+
+    async def count_products(self, filters: Dict[str, Any] = None) -> int:
+        return await self.db.scalar(_filter_products(select(func.count()).select_from(Product), filters))
+
+    async def get_product_by_id(self, product_id: int) -> Optional[Product]:
+        return await self.db.scalar(select(Product).filter(Product.id == product_id))
+
+    async def get_products_by_type(self, type: str, limit: int = 5) -> List[Product]:
+        return list(await self.db.scalars(select(Product).filter(Product.type == type).limit(limit)))
+
+    async def get_products_by_color(self, color: str, limit: int = 5) -> List[Product]:
+        return list(await self.db.scalars(select(Product).filter(Product.color == color).limit(limit)))
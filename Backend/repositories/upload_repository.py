@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+
+from Backend.models.domain import UploadBlob
+
+
+class UploadRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_digest(self, digest: str) -> Optional[UploadBlob]:
+        return self.db.query(UploadBlob).filter(UploadBlob.digest == digest).first()
+
+    def register(self, digest: str, path: str, size: int) -> None:
+        """Записывает файл в индекс загрузок или обновляет время, когда его загружали в последний раз."""
+        now = datetime.utcnow()
+        # Обновление одним UPDATE, а не чтение и запись строки: параллельные загрузки тех же байт не мешают друг другу
+        if self._touch(digest, path, now):
+            self.db.commit()
+            return
+
+        self.db.add(UploadBlob(digest=digest, path=path, size=size, created_at=now, last_seen_at=now))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Тот же файл параллельно сохранил другой запрос
+            self.db.rollback()
+            self._touch(digest, path, now)
+            self.db.commit()
+
+    def _touch(self, digest: str, path: str, now: datetime) -> bool:
+        result = self.db.execute(
+            update(UploadBlob).where(UploadBlob.digest == digest).values(path=path, last_seen_at=now)
+        )
+        return result.rowcount > 0
@@ -1,19 +1,25 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from Backend.models.domain import User
-from Backend.utils.security import get_password_hash
+from Backend.utils.security import get_password_hash, invalidate_cached_user
 
 
 class UserRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, email: str, name: str, password: str) -> User:
+    def create(self, email: str, name: str, password: Optional[str] = None,
+               password_hash: Optional[str] = None) -> User:
+        # Хэш можно посчитать заранее (в пуле PasswordHasher), чтобы не держать bcrypt в потоке запроса
+        if password is None and password_hash is None:
+            raise ValueError("Either password or password_hash is required")
         user = User(
             email=email,
             name=name,
-            password_hash=get_password_hash(password)
+            password_hash=password_hash if password_hash is not None else get_password_hash(password)
         )
         self.db.add(user)
         self.db.commit()
@@ -26,12 +32,21 @@ class UserRepository:
     def get_by_id(self, user_id: int) -> Optional[User]:
         return self.db.query(User).filter(User.id == user_id).first()
 
+    def update_password_hash(self, user_id: int, password_hash: str) -> Optional[User]:
+        user = self.get_by_id(user_id)
+        if user:
+            user.password_hash = password_hash
+            self.db.commit()
+            self.db.refresh(user)
+        return user
+
     def update_color_type(self, user_id: int, color_type: str) -> Optional[User]:
         user = self.get_by_id(user_id)
         if user:
             user.color_type = color_type
             self.db.commit()
             self.db.refresh(user)
+            invalidate_cached_user(user.email)
         return user
 
     def update_onboarding_status(self, user_id: int, status: bool) -> Optional[User]:
@@ -40,6 +55,7 @@ class UserRepository:
             user.onboarding_completed = status
             self.db.commit()
             self.db.refresh(user)
+            invalidate_cached_user(user.email)
         return user
 
     def get_favorite_outfits(self, user_id: int) -> List[int]:
@@ -64,6 +80,7 @@ class UserRepository:
 
         self.db.commit()
         self.db.refresh(user)
+        invalidate_cached_user(user.email)
         return True
 
     def remove_favorite_outfit(self, user_id: int, outfit_id: int) -> bool:
@@ -81,4 +98,25 @@ class UserRepository:
 
         self.db.commit()
         self.db.refresh(user)
-        return True
\ No newline at end of file
+        invalidate_cached_user(user.email)
+        return True
+
+
+class AsyncUserRepository:
+    """Чтение пользователей через AsyncSession; изменения идут через UserRepository, который сбрасывает кэш."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self.db.scalar(select(User).filter(User.email == email))
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self.db.scalar(select(User).filter(User.id == user_id))
+
+    async def get_favorite_outfits(self, user_id: int) -> List[int]:
+        user = await self.get_by_id(user_id)
+        if not user or not user.favorite_outfits:
+            return []
+
+        return [int(outfit_id) for outfit_id in user.favorite_outfits.split(",") if outfit_id]
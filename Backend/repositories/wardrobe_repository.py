@@ -1,9 +1,25 @@
 from typing import List, Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select
 
 from Backend.models.domain import WardrobeItem
 
+
+def _filter_items(query, user_id: int, filters: Optional[Dict[str, Any]]):
+    # Общие условия для Query синхронного репозитория и Select асинхронного
+    query = query.filter(WardrobeItem.user_id == user_id)
+
+    if filters:
+        if filters.get("type"):
+            query = query.filter(WardrobeItem.type == filters["type"])
+        if filters.get("color"):
+            query = query.filter(WardrobeItem.color == filters["color"])
+        if filters.get("season"):
+            query = query.filter(WardrobeItem.season == filters["season"])
+
+    return query
+
 class WardrobeRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -22,31 +38,27 @@ class WardrobeRepository:
         self.db.refresh(item)
         return item
 
-    def get_items(self, user_id: int, skip: int = 0, limit: int = 10, filters: Dict[str, Any] = None) -> List[WardrobeItem]:
-        query = self.db.query(WardrobeItem).filter(WardrobeItem.user_id == user_id)
+    def create_items(self, user_id: int, items: List[Dict[str, Any]]) -> List[WardrobeItem]:
+        # Все предметы вставляются в одной транзакции: один flush и один commit вместо commit на каждый
+        created = [WardrobeItem(user_id=user_id, **item) for item in items]
+        self.db.add_all(created)
+        self.db.flush()
+        ids = [item.id for item in created]
+        self.db.commit()
 
-        if filters:
-            if filters.get("type"):
-                query = query.filter(WardrobeItem.type == filters["type"])
-            if filters.get("color"):
-                query = query.filter(WardrobeItem.color == filters["color"])
-            if filters.get("season"):
-                query = query.filter(WardrobeItem.season == filters["season"])
+        # После commit объекты устаревают; перечитываем их одним запросом, а не refresh на каждый
+        loaded = {
+            item.id: item
+            for item in self.db.query(WardrobeItem).filter(WardrobeItem.id.in_(ids)).all()
+        }
+        return [loaded[item_id] for item_id in ids]
 
+    def get_items(self, user_id: int, skip: int = 0, limit: int = 10, filters: Dict[str, Any] = None) -> List[WardrobeItem]:
+        query = _filter_items(self.db.query(WardrobeItem), user_id, filters)
         return query.order_by(desc(WardrobeItem.created_at)).offset(skip).limit(limit).all()
 
     def count_items(self, user_id: int, filters: Dict[str, Any] = None) -> int:
-        query = self.db.query(WardrobeItem).filter(WardrobeItem.user_id == user_id)
-
-        if filters:
-            if filters.get("type"):
-                query = query.filter(WardrobeItem.type == filters["type"])
-            if filters.get("color"):
-                query = query.filter(WardrobeItem.color == filters["color"])
-            if filters.get("season"):
-                query = query.filter(WardrobeItem.season == filters["season"])
-
-        return query.count()
+        return _filter_items(self.db.query(WardrobeItem), user_id, filters).count()
 
     def get_item_by_id(self, item_id: int, user_id: int) -> Optional[WardrobeItem]:
         return self.db.query(WardrobeItem).filter(
@@ -74,4 +86,26 @@ class WardrobeRepository:
 
         self.db.delete(item)
         self.db.commit()
-        return True
\ No newline at end of file
+        return True
+
+
+class AsyncWardrobeRepository:
+    """Чтение гардероба через AsyncSession для эндпоинтов, которые работают как корутины."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_items(self, user_id: int, skip: int = 0, limit: int = 10,
+                        filters: Dict[str, Any] = None) -> List[WardrobeItem]:
+        query = _filter_items(select(WardrobeItem), user_id, filters)
+        result = await self.db.scalars(query.order_by(desc(WardrobeItem.created_at)).offset(skip).limit(limit))
+        return list(result)
+
+    async def count_items(self, user_id: int, filters: Dict[str, Any] = None) -> int:
+        query = _filter_items(select(func.count()).select_from(WardrobeItem), user_id, filters)
+        return await self.db.scalar(query)
+
+    async def get_item_by_id(self, item_id: int, user_id: int) -> Optional[WardrobeItem]:
+        return await self.db.scalar(
+            select(WardrobeItem).filter(WardrobeItem.id == item_id, WardrobeItem.user_id == user_id)
+        )
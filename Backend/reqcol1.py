@@ -1,32 +1,14 @@
+import argparse
 import os
+import time
+from functools import lru_cache
 from PIL import Image
 import numpy as np
 
+from Backend.config import get_settings
 
-
-def get_random_pixels(image, num_pixels=80):
-    # pixels = list(image.getdata())
-    # sp= random.sample(pixels, min(num_pixels, len(pixels)))
-    sp=[]
-    st={(46, 24), (49, 23), (31, 23), (31, 26), (45, 22), (47, 25), (36, 22), (47, 28), (42, 23), (42, 26), (33, 23), (44, 23), (44, 26), (35, 26), (49, 25), (35, 29), (38, 22), (48, 29), (31, 25), (31, 22), (45, 21), (34, 21), (37, 26), (36, 24), (47, 24), (42, 22), (42, 28), (44, 28), (35, 28), (39, 22), (38, 24), (31, 24), (45, 26), (36, 23), (47, 23), (37, 22), (42, 24), (44, 21), (41, 28), (44, 24)}
-    # st=set()
-    # while len(st)<num_pixels//2:
-    #     st.add((random.randint(31,39), random.randint(21,29)))
-    #     st.add((random.randint(41, 49), random.randint(21, 29)))
-    # print(len(st))
-    # print(st)
-
-    for x, y in st:
-        sp.append(image.getpixel((x, y)))
-
-    print(sp)
-
-    return sp
-
-
-def average_color(pixels):
-    pixels_rgb = [pixel[:3] for pixel in pixels]
-    return tuple(np.mean(pixels_rgb, axis=0).astype(int))
+# Увеличивается при любом изменении алгоритма определения цвета: входит в ключ кэша результатов
+COLOR_ALGORITHM_VERSION = 3
 
 
 def classify_color(rgb):
@@ -78,7 +60,127 @@ def classify_color(rgb):
     return "Неопределенный"
 
 
-def detect_clothing_color(image_path, num_pixels=80):
+# Порядок имен задает коды в таблице цветов (get_color_lut)
+COLOR_NAMES = [
+    "Черный", "Белый", "Серый", "Красный", "Бордовый", "Оранжевый", "Коричневый", "Розовый",
+    "Зеленый", "Оливковый", "Синий", "Голубой", "Фиолетовый", "Желтый", "Бежевый", "Неопределенный"
+]
+
+
+
+def color_lut_path():
+    # Таблица - кэш, а не часть пакета: каталог пакета может быть только для чтения
+    configured = get_settings().color_lut_path
+    if configured:
+        return configured
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "clothify", "color_lut.npy")
+
+
+def classify_color_array(rgb):
+    # Векторная копия classify_color: для массива (..., 3) возвращает коды цветов из COLOR_NAMES.
+    # np.select берет первое истинное условие, что повторяет порядок if/elif в classify_color.
+    rgb = np.asarray(rgb, dtype=np.int32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    total = r + g + b
+
+    red_max = (r > g) & (r > b)
+    green_max = (g > r) & (g > b)
+    blue_max = (b > r) & (b > g)
+    yellowish = (r > 150) & (g > 150) & (b < 100)
+
+    conditions = [
+        total < 150,
+        total > 720,
+        (total >= 150) & (total <= 600) & (abs(r - g) < 30) & (abs(g - b) < 30) & (abs(r - b) < 30),
+        red_max & (g < 100) & (b < 100) & (r > 200),
+        red_max & (g < 100) & (b < 100),
+        red_max & (g > 100) & (b < 100) & (r > 200),
+        red_max & (g > 100) & (b < 100),
+        red_max & (g > 100) & (b > 100),
+        green_max & (r < 100) & (b < 100),
+        green_max & (r > 100) & (b < 100),
+        blue_max & (r < 100) & (g < 100),
+        blue_max & (r < 100) & (g > 100),
+        blue_max & (r > 100) & (g < 100),
+        yellowish & (r > 200) & (g > 200),
+        yellowish,
+    ]
+    return np.select(conditions, np.arange(len(conditions), dtype=np.uint8), len(conditions)).astype(np.uint8)
+
+
+def build_color_lut():
+    # Таблица на весь RGB-куб: 256^3 байт, индекс (r << 16) | (g << 8) | b
+    lut = np.empty((256, 256, 256), dtype=np.uint8)
+    g, b = np.meshgrid(np.arange(256), np.arange(256), indexing="ij")
+    plane = np.empty((256, 256, 3), dtype=np.int32)
+    plane[..., 1] = g
+    plane[..., 2] = b
+    for r in range(256):
+        plane[..., 0] = r
+        lut[r] = classify_color_array(plane)
+    return lut.reshape(-1)
+
+
+def save_color_lut(lut, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(temp_path, lut)
+    os.replace(temp_path, path)
+
+
+def load_color_lut(path=None):
+    # np.load с mmap разделяет таблицу между процессами; заранее ее строит python -m Backend.reqcol1 --build-lut
+    path = path or color_lut_path()
+    if os.path.exists(path):
+        try:
+            lut = np.load(path, mmap_mode="r")
+            if lut.shape == (256 ** 3,) and lut.dtype == np.uint8:
+                return lut
+        except (OSError, ValueError):
+            pass
+
+    print(f"Color LUT not found at {path}, building it (~1s); run `python -m Backend.reqcol1 --build-lut` ahead of time")
+    lut = build_color_lut()
+    try:
+        save_color_lut(lut, path)
+    except OSError as e:
+        print(f"Failed to save color LUT to {path}: {e}; this process keeps a private copy")
+    return lut
+
+
+@lru_cache()
+def get_color_lut():
+    # Таблица загружается при первом определении цвета, а не при импорте модуля
+    return load_color_lut()
+
+
+def classify_colors(pixels):
+    # Классифицирует любое число пикселей одним индексированием: (..., 3|4) uint8 -> коды COLOR_NAMES
+    pixels = np.asarray(pixels)
+    r = pixels[..., 0].astype(np.uint32)
+    g = pixels[..., 1].astype(np.uint32)
+    b = pixels[..., 2].astype(np.uint32)
+    return get_color_lut()[(r << 16) | (g << 8) | b]
+
+
+def color_histogram(pixels, mask=None):
+    # Доля каждого цвета среди пикселей (или только среди пикселей маски), по убыванию
+    codes = classify_colors(pixels)
+    if mask is not None:
+        codes = codes[mask]
+    counts = np.bincount(codes.reshape(-1), minlength=len(COLOR_NAMES))
+    total = counts.sum()
+    if total == 0:
+        return {}
+    return {
+        COLOR_NAMES[code]: counts[code] / total
+        for code in np.argsort(counts)[::-1] if counts[code]
+    }
+
+
+def detect_clothing_color(image_path, num_pixels=None):
+    # num_pixels устарел и игнорируется: цвет определяется по всем пикселям переднего плана
     image = Image.open(image_path).convert('RGB')
 
     # Сжатие изображения
@@ -92,9 +194,78 @@ def detect_clothing_color(image_path, num_pixels=80):
     # cropped_image = compressed_image.crop((left, top, right, bottom))
     # cropped_image.save('cropped_fragment.jpg')
 
-    pixels = get_random_pixels(compressed_image, num_pixels)
-    avg_color = average_color(pixels)
-    color_name = classify_color(avg_color)
+    return detect_color_from_thumbnail(compressed_image)
+
+
+def foreground_mask(pixels, tolerance=60, min_coverage=0.05):
+    # Фон оцениваем медианой пикселей по краям кадра; если маска почти пустая, берем весь кадр
+    pixels = np.asarray(pixels)[..., :3].astype(np.int16)
+    border = np.concatenate([pixels[0], pixels[-1], pixels[:, 0], pixels[:, -1]])
+    background = np.median(border, axis=0)
+    mask = np.abs(pixels - background).sum(axis=-1) > tolerance
+    if mask.mean() < min_coverage:
+        return np.ones(mask.shape, dtype=bool)
+    return mask
+
+
+def dominant_colors(pixels, k=3, mask=None, max_iter=20, time_budget_ms=20.0):
+    # Векторный k-means по пикселям (под маской); возвращает [(название, (r, g, b), доля)] по убыванию доли.
+    # Кластеры с одинаковым названием цвета объединяются. Итерации прекращаются по time_budget_ms.
+    started = time.perf_counter()
+    pixels = np.asarray(pixels)[..., :3]
+    if mask is not None:
+        pixels = pixels[mask]
+    samples = pixels.reshape(-1, 3).astype(np.float32)
+    if len(samples) == 0:
+        return []
+
+    # Детерминированная инициализация: центры равномерно по яркости
+    k = max(1, min(k, len(samples)))
+    order = np.argsort(samples.sum(axis=1))
+    centers = samples[order[np.linspace(0, len(samples) - 1, k).astype(int)]]
+
+    labels = np.zeros(len(samples), dtype=np.intp)
+    for _ in range(max_iter):
+        distances = ((samples[:, None, :] - centers[None, :, :]) ** 2).sum(axis=-1)
+        new_labels = distances.argmin(axis=1)
+        converged = np.array_equal(new_labels, labels)
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=samples[:, c], minlength=k) for c in range(3)], axis=1)
+        non_empty = counts > 0
+        centers[non_empty] = sums[non_empty] / counts[non_empty, None]
+        if converged or (time.perf_counter() - started) * 1000 > time_budget_ms:
+            break
+
+    counts = np.bincount(labels, minlength=k)
+    merged = {}
+    for center, count in zip(centers, counts):
+        if count == 0:
+            continue
+        rgb = tuple(int(c) for c in np.clip(np.round(center), 0, 255))
+        name = COLOR_NAMES[get_color_lut()[(rgb[0] << 16) | (rgb[1] << 8) | rgb[2]]]
+        total, weighted = merged.get(name, (0, np.zeros(3)))
+        merged[name] = (total + count, weighted + center * count)
+
+    result = []
+    for name, (count, weighted) in merged.items():
+        rgb = tuple(int(c) for c in np.clip(np.round(weighted / count), 0, 255))
+        result.append((name, rgb, float(count / len(samples))))
+    return sorted(result, key=lambda item: item[2], reverse=True)
+
+
+def detect_dominant_colors(compressed_image, k=3, time_budget_ms=20.0):
+    pixels = np.asarray(compressed_image.convert('RGB'))
+    return dominant_colors(pixels, k=k, mask=foreground_mask(pixels), time_budget_ms=time_budget_ms)
+
+
+def detect_color_from_thumbnail(compressed_image):
+    # Принимает уже сжатое до 80x80 RGB-изображение, чтобы не декодировать файл повторно.
+    # Цвет одежды - самый крупный кластер переднего плана.
+    colors = detect_dominant_colors(compressed_image)
+    if not colors:
+        return "Неопределенный", (0, 0, 0)
+    color_name, avg_color, _ = colors[0]
 
     return color_name, avg_color
 
@@ -129,16 +300,20 @@ def test():
             print("\n")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Построение таблицы цветов на весь RGB-куб")
+    parser.add_argument("--build-lut", action="store_true", help="построить таблицу и сохранить ее в --output")
+    parser.add_argument("--output", help="по умолчанию color_lut_path из настроек или ~/.cache/clothify/color_lut.npy")
+    args = parser.parse_args()
 
+    if not args.build_lut:
+        parser.print_help()
+        return
+    path = args.output or color_lut_path()
+    started = time.perf_counter()
+    save_color_lut(build_color_lut(), path)
+    print(f"Saved color LUT to {path} in {time.perf_counter() - started:.1f}s")
 
 
-
-
-
-
-
-
-
-
-
-
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 from datetime import timedelta
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from Backend.repositories.user_repository import UserRepository
-from Backend.utils.security import verify_password, create_access_token
+from Backend.services.password_hasher import get_password_hasher
+from Backend.utils.security import create_access_token
 from Backend.models.schemas import UserCreate, UserLogin, Token, UserResponse
 from Backend.config import get_settings
 
@@ -15,8 +17,8 @@ class AuthService:
         self.db = db
         self.user_repository = UserRepository(db)
 
-    def register(self, user_data: UserCreate) -> Token:
-        existing_user = self.user_repository.get_by_email(user_data.email)
+    async def register(self, user_data: UserCreate) -> Token:
+        existing_user = await run_in_threadpool(self.user_repository.get_by_email, user_data.email)
 
         if existing_user:
             raise HTTPException(
@@ -24,10 +26,12 @@ class AuthService:
                 detail="This email is already registered. Please use a different email or try logging in."
             )
 
-        user = self.user_repository.create(
+        password_hash = await get_password_hasher().hash(user_data.password)
+        user = await run_in_threadpool(
+            self.user_repository.create,
             email=user_data.email,
             name=user_data.name,
-            password=user_data.password
+            password_hash=password_hash
         )
 
         access_token = create_access_token(data={"sub": user.email})
@@ -38,28 +42,23 @@ class AuthService:
             user=UserResponse.model_validate(user)
         )
 
-    def login(self, user_data: UserLogin) -> Token:
-        user = self.user_repository.get_by_email(user_data.email)
+    async def login(self, user_data: UserLogin) -> Token:
+        return await self._login(user_data.email, user_data.password)
 
-        if not user or not verify_password(user_data.password, user.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid email or password. Please check your credentials and try again.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        access_token = create_access_token(data={"sub": user.email})
+    async def login_with_form(self, username: str, password: str) -> Token:
+        return await self._login(username, password)
 
-        return Token(
-            access_token=access_token,
-            token_type="bearer",
-            user=UserResponse.model_validate(user)
-        )
+    async def _login(self, email: str, password: str) -> Token:
+        user = await run_in_threadpool(self.user_repository.get_by_email, email)
 
-    def login_with_form(self, username: str, password: str) -> Token:
-        user = self.user_repository.get_by_email(username)
+        verified = False
+        if user:
+            verified, new_hash = await get_password_hasher().verify_and_update(password, user.password_hash)
+            # Параметры bcrypt изменились - сохраняем пересчитанный хэш, пока пароль известен
+            if verified and new_hash:
+                await run_in_threadpool(self.user_repository.update_password_hash, user.id, new_hash)
 
-        if not user or not verify_password(password, user.password_hash):
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password. Please check your credentials and try again.",
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from Backend.config import get_settings
+from Backend.services.model_registry import get_model_registry
+from Backend.utils import metrics
+
+
+class MicroBatcher:
+    """Собирает одиночные изображения из параллельных запросов в один вызов predict."""
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 16,
+        window_ms: float = 10.0,
+        max_queue_size: int = 128,
+        name: str = "ml.batcher",
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = max(0.0, window_ms) / 1000.0
+        self.name = name
+        self._queue: "queue.Queue[Tuple[np.ndarray, Future, float]]" = queue.Queue(maxsize=max_queue_size)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, sample: np.ndarray) -> Future:
+        """Ставит одно изображение в очередь. Бросает queue.Full, если очередь переполнена."""
+        if self._stopped.is_set():
+            raise RuntimeError(f"{self.name} is stopped")
+
+        future: Future = Future()
+        self._queue.put_nowait((sample, future, time.perf_counter()))
+        metrics.set_gauge(f"{self.name}.queue_depth", self._queue.qsize())
+        return future
+
+    def predict(self, sample: np.ndarray, timeout: float = None) -> np.ndarray:
+        return self.submit(sample).result(timeout=timeout)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join(timeout=5)
+
+        # Не оставляем ожидающие запросы висеть после остановки
+        while True:
+            try:
+                _, future, _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError(f"{self.name} is stopped"))
+
+    def _collect(self) -> List[Tuple[np.ndarray, Future, float]]:
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            metrics.set_gauge(f"{self.name}.queue_depth", self._queue.qsize())
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                metrics.observe(f"{self.name}.queue_wait_ms", (started - enqueued) * 1000)
+
+            try:
+                predictions = self.predict_fn(np.stack([sample for sample, _, _ in batch]))
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                metrics.observe(f"{self.name}.batch_latency_ms", (time.perf_counter() - started) * 1000)
+                metrics.observe(f"{self.name}.batch_size", len(batch))
+
+            for (_, future, _), prediction in zip(batch, predictions):
+                future.set_result(prediction)
+
+
+def _predict_with_current_model(batch: np.ndarray) -> np.ndarray:
+    # Модель берется из реестра на каждый батч, чтобы горячая замена .h5 подхватывалась сразу
+    model = get_model_registry().get_model()
+    if model is None:
+        raise RuntimeError("Fashion classifier model is not loaded")
+    return model.predict(batch)
+
+
+@lru_cache()
+def get_classifier_batcher() -> MicroBatcher:
+    settings = get_settings()
+    return MicroBatcher(
+        _predict_with_current_model,
+        max_batch_size=settings.ml_batch_max_size,
+        window_ms=settings.ml_batch_window_ms,
+        max_queue_size=settings.ml_batch_queue_depth,
+        name="ml.classifier",
+    )
+
+
+def shutdown_classifier_batcher() -> None:
+    if get_classifier_batcher.cache_info().currsize:
+        get_classifier_batcher().stop()
+        get_classifier_batcher.cache_clear()
@@ -0,0 +1,37 @@
+import os
+import uuid
+
+from PIL import Image
+
+from Backend.utils import metrics
+from Backend.utils.derivative_names import DERIVATIVE_SIZES, derivative_format, derivative_path
+
+
+def create_derivative(original_path: str, size: str) -> str:
+    path = derivative_path(original_path, size)
+    if os.path.exists(path):
+        return path
+
+    pillow_format, _ = derivative_format()
+    max_side = DERIVATIVE_SIZES[size]
+    with Image.open(original_path) as image:
+        # JPEG сразу декодируется в уменьшенном масштабе
+        image.draft("RGB", (max_side, max_side))
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha and pillow_format == "WEBP" else "RGB")
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        image.save(temp_path, pillow_format, quality=80)
+    os.replace(temp_path, path)
+    metrics.increment("uploads.derivatives.created")
+    return path
+
+
+def create_derivatives(original_path: str) -> None:
+    """Готовит все уменьшенные копии сразу после загрузки; ошибки не мешают сохранению оригинала."""
+    for size in DERIVATIVE_SIZES:
+        try:
+            create_derivative(original_path, size)
+        except Exception as e:
+            print(f"Failed to create {size} derivative for {original_path}: {e}")
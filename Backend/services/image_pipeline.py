@@ -0,0 +1,54 @@
+import time
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+from PIL import Image
+
+from Backend.utils import metrics
+
+CLASSIFIER_INPUT_SIZE = (224, 224)
+COLOR_THUMBNAIL_SIZE = (80, 80)
+
+
+class PreparedImage(NamedTuple):
+    size: Tuple[int, int]
+    classifier_input: np.ndarray
+    color_thumbnail: Image.Image
+    timings: Dict[str, float]
+
+
+class StageTimer:
+    """Замеряет длительность этапов обработки и складывает их в метрики ml.pipeline.*."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.timings[stage] = round((now - self._started) * 1000, 3)
+        metrics.observe(f"ml.pipeline.{stage}_ms", self.timings[stage])
+        self._started = now
+
+
+def prepare_image(image_path: str, timer: StageTimer = None) -> PreparedImage:
+    """Декодирует изображение один раз и готовит из него все производные для распознавания."""
+    timer = timer or StageTimer()
+
+    image = Image.open(image_path)
+    size = image.size
+    # Для JPEG декодер сразу уменьшает картинку в 2/4/8 раз, оставляя ее не меньше нужного размера
+    image.draft("RGB", CLASSIFIER_INPUT_SIZE)
+    image = image.convert("RGB")
+    timer.mark("decode")
+
+    classifier_input = np.asarray(image.resize(CLASSIFIER_INPUT_SIZE), dtype=np.float32) / 255.0
+    color_thumbnail = image.resize(COLOR_THUMBNAIL_SIZE)
+    timer.mark("resize")
+
+    return PreparedImage(
+        size=size,
+        classifier_input=classifier_input,
+        color_thumbnail=color_thumbnail,
+        timings=timer.timings
+    )
@@ -0,0 +1,97 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any
+
+import numpy as np
+
+
+class InferenceBackend(ABC):
+    """Общий интерфейс для способов запуска классификатора: predict(batch) -> вероятности классов."""
+
+    name = "backend"
+
+    @abstractmethod
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        ...
+
+
+class KerasBackend(InferenceBackend):
+    name = "keras"
+
+    def __init__(self, model_path: str, num_threads: int = 0):
+        import tensorflow as tf
+
+        if num_threads > 0:
+            try:
+                tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+                tf.config.threading.set_inter_op_parallelism_threads(1)
+            except RuntimeError:
+                # Потоки можно настроить только до инициализации рантайма TensorFlow
+                pass
+
+        self.model = tf.keras.models.load_model(model_path)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        return self.model.predict(batch, verbose=0)
+
+
+class TFLiteBackend(InferenceBackend):
+    """Запуск экспортированной .tflite модели (float32, float16 или int8) через TFLite Interpreter."""
+
+    name = "tflite"
+
+    def __init__(self, model_path: str, num_threads: int = 0):
+        # Легковесные рантаймы не тянут за собой весь TensorFlow; он нужен только как запасной вариант
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            try:
+                from tflite_runtime.interpreter import Interpreter
+            except ImportError:
+                import tensorflow as tf
+                Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads or None)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self._input["shape"][0])
+        # Interpreter не потокобезопасен
+        self._lock = threading.Lock()
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        with self._lock:
+            if len(batch) != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input["index"], [len(batch), *batch.shape[1:]])
+                self.interpreter.allocate_tensors()
+                self._input = self.interpreter.get_input_details()[0]
+                self._output = self.interpreter.get_output_details()[0]
+                self._batch_size = len(batch)
+
+            self.interpreter.set_tensor(self._input["index"], self._quantize(batch, self._input))
+            self.interpreter.invoke()
+            return self._dequantize(self.interpreter.get_tensor(self._output["index"]), self._output)
+
+    @staticmethod
+    def _quantize(batch: np.ndarray, details: Any) -> np.ndarray:
+        dtype = details["dtype"]
+        if dtype in (np.int8, np.uint8):
+            scale, zero_point = details["quantization"]
+            info = np.iinfo(dtype)
+            return np.clip(np.round(batch / scale + zero_point), info.min, info.max).astype(dtype)
+        return batch.astype(dtype)
+
+    @staticmethod
+    def _dequantize(output: np.ndarray, details: Any) -> np.ndarray:
+        if details["dtype"] in (np.int8, np.uint8):
+            scale, zero_point = details["quantization"]
+            return (output.astype(np.float32) - zero_point) * scale
+        return output
+
+
+def create_backend(model_path: str, num_threads: int = 0) -> InferenceBackend:
+    """Выбирает способ запуска по расширению файла модели: .tflite или Keras (.h5/.keras)."""
+    if os.path.splitext(model_path)[1].lower() == ".tflite":
+        return TFLiteBackend(model_path, num_threads)
+    return KerasBackend(model_path, num_threads)
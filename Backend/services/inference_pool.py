@@ -0,0 +1,222 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from fastapi import HTTPException, status
+
+from Backend.config import get_settings
+from Backend.models.schemas import BatchRecognizeResult, MLImageUpload, RecognizeResponse, SegmentationResponse
+from Backend.services.upload_store import StoredUpload
+from Backend.utils import metrics
+
+
+class _WorkerHTTPError(Exception):
+    # HTTPException не переживает pickle между процессами, поэтому передаем код и текст отдельно
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _init_worker() -> None:
+    from Backend.services.model_registry import get_model_registry
+    get_model_registry().warm_up()
+
+
+def _warm_up() -> bool:
+    from Backend.services.model_registry import get_model_registry
+    return get_model_registry().warm_up()
+
+
+def _run_in_worker(func: Callable, *args) -> Tuple[Any, bool]:
+    # Вместе с результатом возвращаем, загружена ли модель в этом воркере: по этому флагу
+    # процессный пул узнает о готовности, даже если прогрев при старте отключен
+    from Backend.services.model_registry import get_model_registry
+    try:
+        return func(*args), get_model_registry().is_loaded
+    except HTTPException as e:
+        raise _WorkerHTTPError(e.status_code, e.detail)
+
+
+def run_recognize(image_data: MLImageUpload) -> RecognizeResponse:
+    from Backend.services.ml_service import MLService
+    return MLService().recognize_clothing(image_data)
+
+
+def run_recognize_batch(images: List[MLImageUpload], offset: int) -> List[BatchRecognizeResult]:
+    from Backend.services.ml_service import MLService
+    return MLService().recognize_batch(images, offset)
+
+
+def run_segment(image_data: MLImageUpload) -> SegmentationResponse:
+    from Backend.services.ml_service import MLService
+    return MLService().segment_image(image_data)
+
+
+def run_recognize_upload(upload: StoredUpload, file_name: str) -> RecognizeResponse:
+    from Backend.services.ml_service import MLService
+    return MLService().recognize_upload(upload, file_name)
+
+
+def run_segment_upload(upload: StoredUpload) -> SegmentationResponse:
+    from Backend.services.ml_service import MLService
+    return MLService().segment_upload(upload)
+
+
+class InferencePool:
+    """Отдельный пул для ML-задач, чтобы они не занимали общий threadpool Starlette."""
+
+    def __init__(self, workers: int = 0, threads: int = 4, max_pending: int = 32):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._workers_ready = False
+        self._executor: Executor
+        if workers > 0:
+            # spawn вместо fork: TensorFlow плохо переносит fork после инициализации
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="ml-inference")
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def is_ready(self) -> bool:
+        if self.workers > 0:
+            # Процессы-воркеры загружают модель в _init_worker; готовность видна после warm_up()
+            # или первой задачи, выполненной воркером с загруженной моделью
+            return self._workers_ready
+        from Backend.services.model_registry import get_model_registry
+        return get_model_registry().is_loaded
+
+    async def warm_up(self) -> bool:
+        """Загружает модель в фоне после старта: в потоке пула или в каждом процессе-воркере."""
+        started = time.perf_counter()
+        futures = [self._executor.submit(_warm_up) for _ in range(max(1, self.workers))]
+        results = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures), return_exceptions=True)
+        ready = all(result is True for result in results)
+        self._workers_ready = ready
+        metrics.set_gauge("ml.warm_up_seconds", round(time.perf_counter() - started, 3))
+        return ready
+
+    async def submit(self, func: Callable, *args) -> Any:
+        if self._pending >= self.max_pending:
+            metrics.increment("ml.inference.rejected")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="The recognition service is busy. Please try again later.",
+                headers={"Retry-After": "1"}
+            )
+
+        # Счетчик меняется только из event loop, поэтому блокировка не нужна
+        self._pending += 1
+        metrics.set_gauge("ml.inference.pending", self._pending)
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(_run_in_worker, func, *args)
+        except Exception:
+            self._release()
+            raise
+        # Слот освобождается, когда задача закончилась в пуле, а не когда ожидание отменено: после
+        # отключения клиента задача еще выполняется, и пул иначе принял бы больше max_pending задач
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+        try:
+            result, model_loaded = await asyncio.wrap_future(future)
+            self._workers_ready = self._workers_ready or model_loaded
+            return result
+        except _WorkerHTTPError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        finally:
+            metrics.observe("ml.inference.latency_ms", (time.perf_counter() - started) * 1000)
+
+    def _release(self) -> None:
+        self._pending -= 1
+        metrics.set_gauge("ml.inference.pending", self._pending)
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Колбэк future вызывается в потоке пула, а счетчик принадлежит event loop
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # Event loop уже закрыт при остановке приложения - считать больше нечего
+            pass
+
+    def run(self, func: Callable, *args) -> Any:
+        """Синхронный вариант submit для фоновых потоков: ждет результат без лимита max_pending."""
+        started = time.perf_counter()
+        try:
+            result, model_loaded = self._executor.submit(_run_in_worker, func, *args).result()
+            self._workers_ready = self._workers_ready or model_loaded
+            return result
+        except _WorkerHTTPError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        finally:
+            metrics.observe("ml.inference.latency_ms", (time.perf_counter() - started) * 1000)
+
+    def shutdown(self, wait: bool = True) -> None:
+        # Уже принятые задачи дорабатывают: отмена оборвала бы запросы и фоновые задания при деплое
+        self._executor.shutdown(wait=wait, cancel_futures=False)
+
+
+@lru_cache()
+def get_inference_pool() -> InferencePool:
+    settings = get_settings()
+    return InferencePool(
+        workers=settings.ml_inference_workers,
+        threads=settings.ml_inference_threads,
+        max_pending=settings.ml_inference_max_pending
+    )
+
+
+def recognize_image_chunks(images: List[MLImageUpload], partial: bool = True) -> List[Awaitable[List[BatchRecognizeResult]]]:
+    """Делит изображения на части по ml_batch_max_size; каждая часть - одна задача пула с общим прогоном модели.
+
+    С partial=True отказ пула (например, 429) превращается в ошибки изображений этой части.
+    """
+    settings = get_settings()
+    if not images:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No images provided")
+    if len(images) > settings.ml_recognize_batch_max_images:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many images. Maximum is {settings.ml_recognize_batch_max_images} per request."
+        )
+
+    chunk_size = max(1, settings.ml_batch_max_size)
+    return [
+        _recognize_chunk(images[offset:offset + chunk_size], offset, partial)
+        for offset in range(0, len(images), chunk_size)
+    ]
+
+
+async def recognize_images(images: List[MLImageUpload], partial: bool = True) -> List[BatchRecognizeResult]:
+    chunks = await asyncio.gather(*recognize_image_chunks(images, partial))
+    return [result for chunk in chunks for result in chunk]
+
+
+async def _recognize_chunk(images: List[MLImageUpload], offset: int, partial: bool) -> List[BatchRecognizeResult]:
+    try:
+        return await get_inference_pool().submit(run_recognize_batch, images, offset)
+    except HTTPException as e:
+        if not partial:
+            raise
+        return [
+            BatchRecognizeResult(index=offset + position, file_name=image.file_name, error=str(e.detail))
+            for position, image in enumerate(images)
+        ]
+
+
+def shutdown_inference_pool() -> None:
+    if get_inference_pool.cache_info().currsize:
+        get_inference_pool().shutdown()
+        get_inference_pool.cache_clear()
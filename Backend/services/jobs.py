@@ -0,0 +1,161 @@
+import queue
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from Backend.config import get_settings
+from Backend.services.inference_pool import get_inference_pool
+from Backend.utils import metrics
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class Job:
+    def __init__(self, kind: str, owner_id: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.owner_id = owner_id
+        self.status = JOB_QUEUED
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+
+class JobQueue:
+    """Очередь фоновых ML-задач: клиент сразу получает id задачи и опрашивает ее статус.
+
+    Задачи хранятся в памяти процесса и теряются при перезапуске; завершенные удаляются через ttl_seconds.
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 256, ttl_seconds: float = 3600.0, name: str = "ml.jobs"):
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self._jobs: Dict[str, Job] = {}
+        self._jobs_lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[Job, Callable, tuple]]" = queue.Queue(maxsize=max_queued)
+        self._stopped = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        self._threads.append(threading.Thread(target=self._cleanup_loop, name=f"{name}-cleanup", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def is_full(self) -> bool:
+        return self._queue.full()
+
+    def submit(self, kind: str, owner_id: int, func: Callable, *args) -> Job:
+        """Ставит задачу в очередь. Бросает queue.Full, если очередь переполнена."""
+        if self._stopped.is_set():
+            raise RuntimeError(f"{self.name} is stopped")
+
+        job = Job(kind, owner_id)
+        self._queue.put_nowait((job, func, args))
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        metrics.increment(f"{self.name}.submitted")
+        metrics.set_gauge(f"{self.name}.queue_depth", self._queue.qsize())
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def cleanup(self) -> int:
+        """Удаляет завершенные задачи старше ttl_seconds и возвращает их количество."""
+        expired_before = time.time() - self.ttl_seconds
+        with self._jobs_lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.is_finished and job.finished_at < expired_before
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        if expired:
+            metrics.increment(f"{self.name}.expired", len(expired))
+        return len(expired)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+        # Задачи, которые так и не начали выполняться, помечаем как неудавшиеся
+        while True:
+            try:
+                job, _, _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(job, error=f"{self.name} is stopped")
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                job, func, args = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            metrics.set_gauge(f"{self.name}.queue_depth", self._queue.qsize())
+            job.started_at = time.time()
+            job.status = JOB_RUNNING
+            metrics.observe(f"{self.name}.queue_wait_ms", (job.started_at - job.created_at) * 1000)
+
+            try:
+                # Выполняем в пуле инференса, чтобы задачи попадали в процессы-воркеры с моделью, если они есть
+                result = get_inference_pool().run(func, *args)
+            except HTTPException as e:
+                self._finish(job, error=str(e.detail))
+            except Exception as e:
+                self._finish(job, error=str(e))
+            else:
+                self._finish(job, result=result.model_dump() if hasattr(result, "model_dump") else result)
+
+    def _finish(self, job: Job, result: Any = None, error: Optional[str] = None) -> None:
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.status = JOB_FAILED if error is not None else JOB_SUCCEEDED
+        metrics.increment(f"{self.name}.{job.status}")
+        if job.started_at is not None:
+            metrics.observe(f"{self.name}.run_ms", (job.finished_at - job.started_at) * 1000)
+        metrics.observe(f"{self.name}.latency_ms", (job.finished_at - job.created_at) * 1000)
+
+    def _cleanup_loop(self) -> None:
+        interval = min(60.0, max(1.0, self.ttl_seconds / 10))
+        while not self._stopped.wait(interval):
+            self.cleanup()
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    settings = get_settings()
+    return JobQueue(
+        workers=settings.ml_job_workers,
+        max_queued=settings.ml_job_queue_size,
+        ttl_seconds=settings.ml_job_ttl_seconds
+    )
+
+
+def shutdown_job_queue() -> None:
+    if get_job_queue.cache_info().currsize:
+        get_job_queue().stop()
+        get_job_queue.cache_clear()
@@ -2,15 +2,33 @@ import base64
 import os
 import random
 import io
-from typing import List, Dict, Any
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple
 from fastapi import HTTPException, status
 import uuid
 from PIL import Image
-import tensorflow as tf
 import numpy as np
 import reqcol
 
-from Backend.models.schemas import MLImageUpload, DetectedClothing, RecognizeResponse, SegmentationResponse
+from Backend.models.schemas import (
+    MLImageUpload,
+    DetectedClothing,
+    DetectedColor,
+    RecognizeResponse,
+    BatchRecognizeResult,
+    SegmentationResponse
+)
+from Backend.services.model_registry import get_model_registry
+from Backend.services.batching import get_classifier_batcher
+from Backend.services.segmentation import segment, segmentation_key
+from Backend.services.derivatives import create_derivatives
+from Backend.services.image_pipeline import PreparedImage, prepare_image, StageTimer
+from Backend.services.upload_store import StoredUpload, get_upload_store
+from Backend.services.result_cache import get_result_cache, recognition_cache_key
+from Backend.config import get_settings
+from Backend.utils import metrics
 
 try:
     from g4f.client import Client
@@ -45,18 +63,18 @@ except ImportError:
 
 class MLService:
     def __init__(self):
-        self.upload_dir = os.path.join(os.getcwd(), "uploads")
-        os.makedirs(self.upload_dir, exist_ok=True)
+        self.upload_store = get_upload_store()
+        self.upload_dir = self.upload_store.upload_dir
 
-        try:
-            self.model = tf.keras.models.load_model("v80_4.5fashion_classifier.h5")
-            print("Fashion classifier model loaded successfully")
-        except Exception as e:
-            print(f"Failed to load fashion classifier model: {e}")
-            self.model = None
+        # Модель загружается один раз на процесс и разделяется между всеми запросами
+        self.model = get_model_registry().get_model()
 
     def recognize_clothing(self, image_data: MLImageUpload) -> RecognizeResponse:
-        image_path = self._save_image(image_data)
+        upload = self._save_image(image_data)
+        return self.recognize_upload(upload, image_data.file_name)
+
+    def recognize_upload(self, upload: StoredUpload, file_name: str) -> RecognizeResponse:
+        image_path = upload.path
 
         if not os.path.exists(image_path):
             raise HTTPException(
@@ -64,33 +82,36 @@ class MLService:
                 detail="Failed to save image"
             )
 
+        # Повторная загрузка той же фотографии отдается из кэша без повторного прогона модели
+        cache_key = None
+        if self.model:
+            cache_key = self._cache_key(upload.digest)
+            cached = get_result_cache().get(cache_key)
+            if cached is not None:
+                return cached
+
         detected_items = []
+        cacheable = cache_key is not None
 
         try:
-            color_name, _ = reqcol.detect_clothing_color(image_path)
+            # Файл декодируется один раз; цвет, класс и размеры считаются из одного изображения
+            timer = StageTimer()
+            prepared, dominant_colors = self._prepare(image_path, timer)
 
             if self.model:
-                item_type = self._predict_clothing_type(image_path)
+                item_type = self._predict_clothing_type(prepared.classifier_input)
                 confidence = 0.85
             else:
-                item_type = self._predict_from_filename(image_data.file_name)
+                item_type = self._predict_from_filename(file_name)
                 confidence = 0.7
+            timer.mark("classify")
 
-            width, height = Image.open(image_path).size
-
-            detected_items.append(
-                DetectedClothing(
-                    type=item_type,
-                    color=color_name,
-                    confidence=confidence,
-                    x=width // 4,
-                    y=height // 4,
-                    width=width // 2,
-                    height=height // 2
-                )
-            )
+            detected_items.append(self._detection(prepared, dominant_colors, item_type, confidence))
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error during recognition: {e}")
+            cacheable = False
             detected_items.append(
                 DetectedClothing(
                     type="неизвестно",
@@ -103,60 +124,195 @@ class MLService:
                 )
             )
 
-        return RecognizeResponse(detected_items=detected_items)
+        response = RecognizeResponse(detected_items=detected_items)
+        if cacheable:
+            get_result_cache().set(cache_key, response)
+        return response
+
+    def recognize_batch(self, images: List[MLImageUpload], offset: int = 0) -> List[BatchRecognizeResult]:
+        """Распознает несколько изображений: параллельные сохранение и декодирование и один общий прогон модели.
+
+        Ошибка в одном изображении не прерывает обработку остальных - она возвращается в поле error.
+        """
+        results: Dict[int, BatchRecognizeResult] = {}
+        prepared_images = []
+
+        # Сохранение (base64, SHA-256, запись на диск, уменьшенные копии) и декодирование в PIL отпускают GIL,
+        # поэтому каждое изображение целиком обрабатывается в своем потоке
+        if images:
+            threads = min(len(images), max(1, get_settings().ml_recognize_batch_decode_threads))
+            with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="ml-decode") as executor:
+                futures = [executor.submit(self._save_and_prepare, image_data) for image_data in images]
+                for position, (image_data, future) in enumerate(zip(images, futures)):
+                    index = offset + position
+                    try:
+                        upload, cache_key, cached, prepared = future.result()
+                    except HTTPException as e:
+                        results[index] = BatchRecognizeResult(index=index, file_name=image_data.file_name, error=str(e.detail))
+                        continue
+                    except Exception as e:
+                        results[index] = BatchRecognizeResult(
+                            index=index, file_name=image_data.file_name, error=f"Failed to decode image: {e}"
+                        )
+                        continue
+
+                    if cached is not None:
+                        results[index] = BatchRecognizeResult(
+                            index=index,
+                            file_name=image_data.file_name,
+                            image_url=upload.url,
+                            detected_items=cached.detected_items
+                        )
+                    else:
+                        prepared_images.append((index, image_data.file_name, upload.url, cache_key, *prepared))
+
+        if prepared_images:
+            try:
+                if self.model:
+                    batch = np.stack([prepared.classifier_input for _, _, _, _, prepared, _ in prepared_images])
+                    started = time.perf_counter()
+                    predictions = self.model.predict(batch)
+                    metrics.observe("ml.recognize_batch.forward_ms", (time.perf_counter() - started) * 1000)
+                    metrics.observe("ml.recognize_batch.batch_size", len(batch))
+                    item_types = [self._class_name(prediction) for prediction in predictions]
+                    confidence = 0.85
+                else:
+                    item_types = [self._predict_from_filename(file_name) for _, file_name, _, _, _, _ in prepared_images]
+                    confidence = 0.7
+
+                for (index, file_name, image_url, cache_key, prepared, dominant_colors), item_type in zip(prepared_images, item_types):
+                    response = RecognizeResponse(
+                        detected_items=[self._detection(prepared, dominant_colors, item_type, confidence)]
+                    )
+                    if cache_key is not None:
+                        get_result_cache().set(cache_key, response)
+                    results[index] = BatchRecognizeResult(
+                        index=index, file_name=file_name, image_url=image_url, detected_items=response.detected_items
+                    )
+            except Exception as e:
+                print(f"Error during batch recognition: {e}")
+                for index, file_name, _, _, _, _ in prepared_images:
+                    results[index] = BatchRecognizeResult(index=index, file_name=file_name, error=f"Recognition failed: {e}")
+
+        return [results[index] for index in sorted(results)]
+
+    def _save_and_prepare(self, image_data: MLImageUpload):
+        """Сохраняет изображение и, если результата нет в кэше, декодирует его для пакетного прогона."""
+        upload = self._save_image(image_data)
+        cache_key = None
+        if self.model:
+            cache_key = self._cache_key(upload.digest)
+            cached = get_result_cache().get(cache_key)
+            if cached is not None:
+                return upload, cache_key, cached, None
+        return upload, cache_key, None, self._prepare(upload.path)
 
     def segment_image(self, image_data: MLImageUpload) -> SegmentationResponse:
-        image_path = self._save_image(image_data)
+        upload = self._save_image(image_data)
+        return self.segment_upload(upload)
+
+    def segment_upload(self, upload: StoredUpload) -> SegmentationResponse:
+        settings = get_settings()
+        params = dict(
+            mode=settings.segment_mode,
+            tolerance=settings.segment_tolerance,
+            background=settings.segment_background_sampling,
+            mask_size=settings.segment_mask_size,
+            morphology_size=settings.segment_morphology_size
+        )
+        # Параметры входят в имя: после смены настроек старый результат не подменяет новый
+        segmented_path = os.path.join(
+            self.upload_store.shard_dir(upload.digest), f"segmented_{upload.digest}_{segmentation_key(**params)}.png"
+        )
 
         try:
-            original_image = Image.open(image_path)
-
-            if original_image.mode != 'RGBA':
-                original_image = original_image.convert('RGBA')
-
-            background_color = original_image.getpixel((0, 0))
-            transparent_image = Image.new("RGBA", original_image.size, (0, 0, 0, 0))
-
-            for y in range(original_image.size[1]):
-                for x in range(original_image.size[0]):
-                    current_color = original_image.getpixel((x, y))
-                    diff = sum(abs(a-b) for a, b in zip(current_color, background_color))
-                    if diff > 50:
-                        transparent_image.putpixel((x, y), current_color)
-
-            filename = f"segmented_{os.path.basename(image_path)}"
-            segmented_path = os.path.join(self.upload_dir, filename)
-            transparent_image.save(segmented_path, "PNG")
-
-            return SegmentationResponse(segmented_image_url=f"/uploads/{filename}")
+            # Результат сегментации тоже адресуется хэшем, поэтому уже готовый файл не пересчитываем
+            if not os.path.exists(segmented_path):
+                original_image = Image.open(upload.path)
+                transparent_image = segment(original_image, **params)
+
+                temp_path = f"{segmented_path}.{uuid.uuid4().hex}.tmp"
+                transparent_image.save(temp_path, "PNG")
+                os.replace(temp_path, segmented_path)
+                if settings.upload_derivatives_on_upload:
+                    create_derivatives(segmented_path)
+
+            return SegmentationResponse(segmented_image_url=self.upload_store.url_for(segmented_path))
         except Exception as e:
             print(f"Error during segmentation: {e}")
-            return SegmentationResponse(segmented_image_url=f"/uploads/{os.path.basename(image_path)}")
-
-    def _save_image(self, image_data: MLImageUpload) -> str:
+            return SegmentationResponse(segmented_image_url=upload.url)
+
+    def _prepare(self, image_path: str, timer: StageTimer = None) -> Tuple[PreparedImage, List[Tuple[str, Tuple[int, int, int], float]]]:
+        timer = timer or StageTimer()
+        prepared = prepare_image(image_path, timer)
+
+        settings = get_settings()
+        dominant_colors = reqcol.detect_dominant_colors(
+            prepared.color_thumbnail,
+            k=settings.color_top_k,
+            time_budget_ms=settings.color_time_budget_ms
+        )
+        timer.mark("color")
+        return prepared, dominant_colors
+
+    def _detection(self, prepared: PreparedImage, dominant_colors, item_type: str, confidence: float) -> DetectedClothing:
+        width, height = prepared.size
+        return DetectedClothing(
+            type=item_type,
+            color=dominant_colors[0][0] if dominant_colors else "Неопределенный",
+            confidence=confidence,
+            x=width // 4,
+            y=height // 4,
+            width=width // 2,
+            height=height // 2,
+            colors=[
+                DetectedColor(name=name, rgb=list(rgb), coverage=round(coverage, 3))
+                for name, rgb, coverage in dominant_colors
+            ]
+        )
+
+    @staticmethod
+    def _cache_key(digest: str) -> str:
+        settings = get_settings()
+        return recognition_cache_key(
+            digest,
+            get_model_registry().version,
+            reqcol.COLOR_ALGORITHM_VERSION,
+            settings.color_top_k,
+            settings.color_time_budget_ms
+        )
+
+    def _save_image(self, image_data: MLImageUpload) -> StoredUpload:
         try:
             image_binary = base64.b64decode(image_data.file_data)
-            filename = f"{uuid.uuid4()}_{image_data.file_name}"
-            filepath = os.path.join(self.upload_dir, filename)
-
-            with open(filepath, "wb") as f:
-                f.write(image_binary)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to save image: {str(e)}"
+            )
 
-            return filepath
+        try:
+            return self.upload_store.put_bytes(image_binary)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to save image: {str(e)}"
             )
 
-    def _predict_clothing_type(self, image_path: str) -> str:
-        img = Image.open(image_path).convert('RGB')
-        img = img.resize((224, 224))
-        img_array = np.array(img) / 255.0
-        img_array = np.expand_dims(img_array, axis=0)
+    def _predict_clothing_type(self, img_array: np.ndarray) -> str:
+        # Одиночное изображение уходит в общий батч вместе с параллельными запросами
+        try:
+            future = get_classifier_batcher().submit(img_array)
+        except queue.Full:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many images are waiting for recognition. Please try again later."
+            )
+        prediction = future.result(timeout=get_settings().ml_batch_timeout_seconds)
+        return self._class_name(prediction)
 
-        prediction = self.model.predict(img_array)
-        class_index = np.argmax(prediction[0])
+    def _class_name(self, prediction: np.ndarray) -> str:
+        class_index = np.argmax(prediction)
 
         clothing_types = [
             "футболка", "брюки", "платье", "куртка", "рубашка",
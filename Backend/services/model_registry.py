@@ -0,0 +1,116 @@
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from Backend.config import get_settings
+from Backend.services.inference_backends import InferenceBackend, create_backend
+
+
+class ModelRegistry:
+    """Хранит классификатор одежды, загруженный один раз на процесс воркера."""
+
+    def __init__(self, model_path: str, fallback_model_path: Optional[str] = None, num_threads: int = 0):
+        self.model_path = model_path
+        self.fallback_model_path = fallback_model_path
+        self.num_threads = num_threads
+        self._model: Optional[InferenceBackend] = None
+        self._version: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._load_failed = False
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    @property
+    def backend_name(self) -> Optional[str]:
+        return self._model.name if self._model is not None else None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def get_model(self) -> Optional[InferenceBackend]:
+        """Возвращает текущую модель, подхватывая новую версию, если файл на диске изменился."""
+        if self._needs_reload():
+            with self._lock:
+                if self._needs_reload():
+                    self._load(self.model_path)
+        return self._model
+
+    def warm_up(self) -> bool:
+        """Загружает модель заранее, чтобы первый запрос не платил за загрузку."""
+        return self.get_model() is not None
+
+    def reload(self, model_path: Optional[str] = None) -> bool:
+        """Переключает реестр на новую версию модели без перезапуска сервера."""
+        with self._lock:
+            return self._load(model_path or self.model_path)
+
+    def _needs_reload(self) -> bool:
+        mtime = self._file_mtime(self.model_path)
+        if self._model is None:
+            # Не пытаемся грузить повторно на каждом запросе, пока файл не появится или не изменится
+            return not self._load_failed or mtime != self._mtime
+        return mtime is not None and mtime != self._mtime
+
+    def _load(self, model_path: str) -> bool:
+        mtime = self._file_mtime(model_path)
+        loaded_path = model_path
+        try:
+            model = create_backend(model_path, self.num_threads)
+        except Exception as e:
+            print(f"Failed to load fashion classifier model: {e}")
+            model = None
+            # Оптимизированная модель (.tflite) не загрузилась - откатываемся на исходную Keras-модель
+            if self.fallback_model_path and self.fallback_model_path != model_path:
+                try:
+                    model = create_backend(self.fallback_model_path, self.num_threads)
+                    loaded_path = self.fallback_model_path
+                except Exception as fallback_error:
+                    print(f"Failed to load fallback fashion classifier model: {fallback_error}")
+
+        if model is None:
+            self._mtime = mtime
+            self._load_failed = self._model is None
+            return False
+
+        # Подменяем модель одной операцией присваивания: запросы, уже получившие
+        # старую модель, спокойно доработают на ней
+        self._model = model
+        self.model_path = model_path
+        self._version = self._file_checksum(loaded_path)
+        self._mtime = mtime
+        self._load_failed = False
+        print(f"Fashion classifier model loaded successfully ({loaded_path}, {model.name}, version {self._version[:12]})")
+        return True
+
+    @staticmethod
+    def _file_mtime(path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _file_checksum(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+@lru_cache()
+def get_model_registry() -> ModelRegistry:
+    settings = get_settings()
+    if settings.ml_backend == "tflite":
+        return ModelRegistry(
+            settings.ml_tflite_model_path,
+            fallback_model_path=settings.ml_model_path,
+            num_threads=settings.ml_num_threads
+        )
+    return ModelRegistry(settings.ml_model_path, num_threads=settings.ml_num_threads)
@@ -1,10 +1,11 @@
 from typing import List, Dict, Optional, Any
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import math
 import random
 
-from Backend.repositories.outfit_repository import OutfitRepository
+from Backend.repositories.outfit_repository import AsyncOutfitRepository, OutfitRepository
 from Backend.repositories.wardrobe_repository import WardrobeRepository
 from Backend.models.domain import WardrobeItem
 from Backend.models.schemas import (
@@ -17,6 +18,27 @@ from Backend.models.schemas import (
     OutfitRecommendationItem
 )
 
+def _outfit_filters(occasion: Optional[str], is_favorite: Optional[bool]) -> Dict[str, Any]:
+    filters = {}
+    if occasion:
+        filters["occasion"] = occasion
+    if is_favorite is not None:
+        filters["is_favorite"] = is_favorite
+    return filters
+
+
+def _outfits_page(outfits, total: int, page: int, size: int) -> OutfitsPage:
+    total_pages = math.ceil(total / size) if total > 0 else 1
+
+    return OutfitsPage(
+        items=[OutfitResponse.model_validate(outfit) for outfit in outfits],
+        total=total,
+        page=page,
+        size=size,
+        pages=total_pages
+    )
+
+
 class OutfitService:
     def __init__(self, db: Session):
         self.db = db
@@ -25,26 +47,12 @@ class OutfitService:
 
     def get_outfits(self, user_id: int, page: int = 1, size: int = 10,
                   occasion: Optional[str] = None, is_favorite: Optional[bool] = None) -> OutfitsPage:
-        filters = {}
-        if occasion:
-            filters["occasion"] = occasion
-        if is_favorite is not None:
-            filters["is_favorite"] = is_favorite
-
+        filters = _outfit_filters(occasion, is_favorite)
         skip = (page - 1) * size
 
         outfits = self.outfit_repository.get_outfits(user_id, skip, size, filters)
         total = self.outfit_repository.count_outfits(user_id, filters)
-
-        total_pages = math.ceil(total / size) if total > 0 else 1
-
-        return OutfitsPage(
-            items=[OutfitResponse.model_validate(outfit) for outfit in outfits],
-            total=total,
-            page=page,
-            size=size,
-            pages=total_pages
-        )
+        return _outfits_page(outfits, total, page, size)
 
     def create_outfit(self, user_id: int, outfit_data: OutfitCreate) -> OutfitResponse:
         outfit = self.outfit_repository.create_outfit(
@@ -221,4 +229,31 @@ class OutfitService:
 
     def _get_random_color(self) -> str:
         colors = ["черный", "белый", "синий", "красный", "зеленый", "желтый", "серый", "бежевый"]
-        return random.choice(colors)
\ No newline at end of file
+        return random.choice(colors)
+
+
+class AsyncOutfitService:
+    """Чтение образов для async-эндпоинтов; создание, изменение и рекомендации остаются в OutfitService."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.outfit_repository = AsyncOutfitRepository(db)
+
+    async def get_outfits(self, user_id: int, page: int = 1, size: int = 10,
+                          occasion: Optional[str] = None, is_favorite: Optional[bool] = None) -> OutfitsPage:
+        filters = _outfit_filters(occasion, is_favorite)
+        skip = (page - 1) * size
+
+        outfits = await self.outfit_repository.get_outfits(user_id, skip, size, filters)
+        total = await self.outfit_repository.count_outfits(user_id, filters)
+        return _outfits_page(outfits, total, page, size)
+
+    async def get_outfit(self, outfit_id: int, user_id: int) -> OutfitResponse:
+        outfit = await self.outfit_repository.get_outfit_by_id(outfit_id, user_id)
+        if not outfit:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Outfit not found"
+            )
+
+        return OutfitResponse.model_validate(outfit)
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from Backend.config import get_settings
+from Backend.utils import metrics
+from Backend.utils.security import pwd_context
+
+
+class PasswordHasher:
+    """Отдельный ограниченный пул для bcrypt, чтобы волна логинов не занимала общий threadpool Starlette.
+
+    bcrypt отпускает GIL, поэтому workers потоков хэшируют параллельно; остальные задачи ждут в очереди.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 64, name: str = "auth.password_hasher"):
+        self.max_pending = max_pending
+        self.name = name
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="password-hasher")
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """Проверяет пароль и, если хэш сделан с устаревшими параметрами, возвращает новый хэш."""
+        return await self._submit(pwd_context.verify_and_update, password, password_hash)
+
+    async def _submit(self, func: Callable, *args):
+        if self._pending >= self.max_pending:
+            metrics.increment(f"{self.name}.rejected")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many sign-in attempts are being processed. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+
+        # Счетчик меняется только из event loop, поэтому блокировка не нужна
+        self._pending += 1
+        metrics.set_gauge(f"{self.name}.pending", self._pending)
+        enqueued = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            metrics.observe(f"{self.name}.queue_wait_ms", (started - enqueued) * 1000)
+            try:
+                return func(*args)
+            finally:
+                metrics.observe(f"{self.name}.run_ms", (time.perf_counter() - started) * 1000)
+
+        try:
+            return await asyncio.wrap_future(self._executor.submit(run))
+        finally:
+            self._pending -= 1
+            metrics.set_gauge(f"{self.name}.pending", self._pending)
+
+    def shutdown(self, wait: bool = True) -> None:
+        # Как и у пула инференса: принятые хэши досчитываются, иначе ждущие логины получат 500
+        self._executor.shutdown(wait=wait, cancel_futures=False)
+
+
+@lru_cache()
+def get_password_hasher() -> PasswordHasher:
+    settings = get_settings()
+    return PasswordHasher(
+        workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending
+    )
+
+
+def shutdown_password_hasher() -> None:
+    if get_password_hasher.cache_info().currsize:
+        get_password_hasher().shutdown()
+        get_password_hasher.cache_clear()
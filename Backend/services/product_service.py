@@ -1,10 +1,11 @@
 from typing import List, Dict, Optional, Any
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import math
 import random
 
-from Backend.repositories.product_repository import ProductRepository
+from Backend.repositories.product_repository import AsyncProductRepository, ProductRepository
 from Backend.repositories.wardrobe_repository import WardrobeRepository
 from Backend.models.schemas import (
     ProductResponse,
@@ -13,6 +14,34 @@ from Backend.models.schemas import (
     ProductRecommendationGroup
 )
 
+def _product_filters(type: Optional[str], color: Optional[str], price_min: Optional[int],
+                     price_max: Optional[int], store: Optional[str]) -> Dict[str, Any]:
+    filters = {}
+    if type:
+        filters["type"] = type
+    if color:
+        filters["color"] = color
+    if price_min is not None:
+        filters["price_min"] = price_min
+    if price_max is not None:
+        filters["price_max"] = price_max
+    if store:
+        filters["store"] = store
+    return filters
+
+
+def _products_page(products, total: int, page: int, size: int) -> ProductsPage:
+    total_pages = math.ceil(total / size) if total > 0 else 1
+
+    return ProductsPage(
+        items=[ProductResponse.model_validate(product) for product in products],
+        total=total,
+        page=page,
+        size=size,
+        pages=total_pages
+    )
+
+
 class ProductService:
     def __init__(self, db: Session):
         self.db = db
@@ -22,32 +51,12 @@ class ProductService:
     def search_products(self, page: int = 1, size: int = 10, type: Optional[str] = None,
                        color: Optional[str] = None, price_min: Optional[int] = None,
                        price_max: Optional[int] = None, store: Optional[str] = None) -> ProductsPage:
-        filters = {}
-        if type:
-            filters["type"] = type
-        if color:
-            filters["color"] = color
-        if price_min is not None:
-            filters["price_min"] = price_min
-        if price_max is not None:
-            filters["price_max"] = price_max
-        if store:
-            filters["store"] = store
-
+        filters = _product_filters(type, color, price_min, price_max, store)
         skip = (page - 1) * size
 
         products = self.product_repository.get_products(skip, size, filters)
         total = self.product_repository.count_products(filters)
-
-        total_pages = math.ceil(total / size) if total > 0 else 1
-
-        return ProductsPage(
-            items=[ProductResponse.model_validate(product) for product in products],
-            total=total,
-            page=page,
-            size=size,
-            pages=total_pages
-        )
+        return _products_page(products, total, page, size)
 
     def get_recommendations(self, user_id: int) -> ProductRecommendations:
         wardrobe_items = self.wardrobe_repository.get_items(user_id, 0, 100)
@@ -101,4 +110,22 @@ class ProductService:
 
         missing = list(all_types - existing_types)
         random.shuffle(missing)
-        return missing
\ No newline at end of file
+        return missing
+
+
+class AsyncProductService:
+    """Поиск по каталогу для async-эндпоинтов."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.product_repository = AsyncProductRepository(db)
+
+    async def search_products(self, page: int = 1, size: int = 10, type: Optional[str] = None,
+                              color: Optional[str] = None, price_min: Optional[int] = None,
+                              price_max: Optional[int] = None, store: Optional[str] = None) -> ProductsPage:
+        filters = _product_filters(type, color, price_min, price_max, store)
+        skip = (page - 1) * size
+
+        products = await self.product_repository.get_products(skip, size, filters)
+        total = await self.product_repository.count_products(filters)
+        return _products_page(products, total, page, size)
@@ -0,0 +1,175 @@
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from Backend.config import get_settings
+from Backend.models.schemas import RecognizeResponse
+from Backend.utils import metrics
+
+
+class CacheTier(ABC):
+    """Уровень кэша. Хранит значения вместе со временем истечения (unix time)."""
+
+    name = "tier"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[BaseModel]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: BaseModel, expires_at: float) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class MemoryCacheTier(CacheTier):
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, BaseModel]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: BaseModel, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.increment("ml.result_cache.evictions")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheTier(CacheTier):
+    """Постоянный уровень кэша в отдельном SQLite-файле, переживает перезапуск воркеров."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, response_model: Type[BaseModel], max_entries: int = 100000):
+        self.path = path
+        self.response_model = response_model
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_result_cache_created_at ON result_cache (created_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM result_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return self.response_model.model_validate_json(row[0])
+
+    def set(self, key: str, value: BaseModel, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                (key, value.model_dump_json(), expires_at, time.time())
+            )
+            # Удаляем просроченные и самые старые записи сверх лимита
+            self._conn.execute("DELETE FROM result_cache WHERE expires_at < ?", (time.time(),))
+            deleted = self._conn.execute(
+                "DELETE FROM result_cache WHERE key IN ("
+                "SELECT key FROM result_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+        if deleted > 0:
+            metrics.increment("ml.result_cache.evictions", deleted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM result_cache")
+            self._conn.commit()
+
+
+class ResultCache:
+    """Многоуровневый кэш результатов распознавания: сначала память, затем постоянные уровни."""
+
+    def __init__(self, tiers: List[CacheTier], ttl_seconds: float = 7 * 24 * 3600, name: str = "ml.result_cache"):
+        self.tiers = tiers
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+
+    def get(self, key: str) -> Optional[Any]:
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                metrics.increment(f"{self.name}.hits")
+                metrics.increment(f"{self.name}.{tier.name}_hits")
+                # Поднимаем найденное значение на более быстрые уровни
+                expires_at = time.time() + self.ttl_seconds
+                for faster_tier in self.tiers[:index]:
+                    faster_tier.set(key, value, expires_at)
+                return value
+
+        metrics.increment(f"{self.name}.misses")
+        return None
+
+    def set(self, key: str, value: BaseModel) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        for tier in self.tiers:
+            tier.set(key, value, expires_at)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+
+def recognition_cache_key(digest: str, model_version: str, color_version: int,
+                          color_top_k: int, color_time_budget_ms: float) -> str:
+    # Версия модели, алгоритма цвета и его настройки входят в ключ: после обновления модели или
+    # смены настроек старые записи просто перестают находиться и вытесняются по TTL и лимиту размера
+    return f"{digest}:{model_version}:{color_version}:{color_top_k}:{color_time_budget_ms}"
+
+
+@lru_cache()
+def get_result_cache() -> ResultCache:
+    settings = get_settings()
+    tiers: List[CacheTier] = [MemoryCacheTier(settings.ml_result_cache_size)]
+    if settings.ml_result_cache_path:
+        tiers.append(SQLiteCacheTier(
+            settings.ml_result_cache_path,
+            RecognizeResponse,
+            max_entries=settings.ml_result_cache_persistent_size
+        ))
+    return ResultCache(tiers, ttl_seconds=settings.ml_result_cache_ttl_seconds)
@@ -0,0 +1,95 @@
+import hashlib
+
+import numpy as np
+from PIL import Image, ImageChops, ImageFilter
+
+BACKGROUND_SAMPLING = ("corner", "corners", "border")
+SEGMENT_MODES = ("full", "multiscale")
+# Увеличивается при изменении алгоритма, чтобы ранее сохраненные результаты не переиспользовались
+SEGMENTATION_VERSION = 1
+
+
+def sample_background(pixels: np.ndarray, strategy: str = "corner") -> np.ndarray:
+    """Оценивает цвет фона RGBA-массива (H, W, 4) по выбранной стратегии."""
+    if strategy == "corner":
+        return pixels[0, 0].astype(np.int16)
+    if strategy == "corners":
+        samples = np.stack([pixels[0, 0], pixels[0, -1], pixels[-1, 0], pixels[-1, -1]])
+    elif strategy == "border":
+        samples = np.concatenate([pixels[0], pixels[-1], pixels[:, 0], pixels[:, -1]])
+    else:
+        raise ValueError(f"Unknown background sampling strategy: {strategy}")
+    return np.median(samples, axis=0).astype(np.int16)
+
+
+def background_mask(pixels: np.ndarray, background: np.ndarray, tolerance: int = 50) -> np.ndarray:
+    """Маска переднего плана: сумма модулей разности по каналам RGBA больше tolerance."""
+    diff = np.zeros(pixels.shape[:2], dtype=np.int16)
+    # Считаем по одному каналу, чтобы не держать в памяти int-копию всего изображения
+    for channel in range(pixels.shape[2]):
+        diff += np.abs(pixels[..., channel].astype(np.int16) - background[channel])
+    return diff > tolerance
+
+
+def remove_background(image: Image.Image, tolerance: int = 50, background: str = "corner") -> Image.Image:
+    """Делает фон прозрачным: пиксели, близкие к цвету фона, заменяются на (0, 0, 0, 0)."""
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    pixels = np.asarray(image)
+    mask = background_mask(pixels, sample_background(pixels, background), tolerance)
+
+    result = np.zeros_like(pixels)
+    result[mask] = pixels[mask]
+    return Image.fromarray(result, "RGBA")
+
+
+def clean_mask(mask: Image.Image, size: int = 3) -> Image.Image:
+    """Морфологическая чистка маски: открытие убирает одиночные точки, закрытие заполняет мелкие дыры."""
+    if size < 3:
+        return mask
+    size |= 1  # фильтрам PIL нужен нечетный размер окна
+    mask = mask.filter(ImageFilter.MinFilter(size)).filter(ImageFilter.MaxFilter(size))
+    return mask.filter(ImageFilter.MaxFilter(size)).filter(ImageFilter.MinFilter(size))
+
+
+def remove_background_multiscale(image: Image.Image, tolerance: int = 50, mask_size: int = 256,
+                                 morphology_size: int = 3) -> Image.Image:
+    """Удаление фона с маской, посчитанной на уменьшенной копии.
+
+    Фон оценивается по всем краям кадра, маска чистится морфологией и растягивается до исходного
+    размера, где становится альфа-каналом. Стоимость почти не зависит от разрешения фотографии.
+    """
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    # Уменьшаем исходное изображение сразу, без полноразмерной RGBA-копии
+    scale = min(1.0, mask_size / max(image.size))
+    small_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    pixels = np.asarray(image.resize(small_size, Image.BILINEAR, reducing_gap=2.0).convert("RGBA"))
+    mask = background_mask(pixels, sample_background(pixels, "border"), tolerance)
+
+    mask_image = clean_mask(Image.fromarray(mask.astype(np.uint8) * 255, "L"), morphology_size)
+    # Билинейное растяжение дает мягкий край вместо ступенек от маленькой маски
+    alpha = mask_image.resize(image.size, Image.BILINEAR)
+    if image.mode == "RGBA":
+        alpha = ImageChops.multiply(image.getchannel("A"), alpha)
+
+    result = image.copy()
+    result.putalpha(alpha)
+    return result
+
+
+def segment(image: Image.Image, mode: str = "full", tolerance: int = 50, background: str = "corner",
+            mask_size: int = 256, morphology_size: int = 3) -> Image.Image:
+    if mode == "multiscale":
+        return remove_background_multiscale(image, tolerance, mask_size, morphology_size)
+    if mode == "full":
+        return remove_background(image, tolerance, background)
+    raise ValueError(f"Unknown segmentation mode: {mode}")
+
+
+def segmentation_key(mode: str, tolerance: int, background: str, mask_size: int, morphology_size: int) -> str:
+    """Короткий хэш версии алгоритма и параметров сегментации для имени файла с результатом."""
+    params = f"{SEGMENTATION_VERSION}:{mode}:{tolerance}:{background}:{mask_size}:{morphology_size}"
+    return hashlib.sha256(params.encode()).hexdigest()[:8]
@@ -0,0 +1,239 @@
+"""Сборка мусора в uploads/: удаляет файлы, на которые не ссылается ни одна вещь гардероба или товар.
+
+Запуск из корня репозитория (по умолчанию только отчет, без удаления):
+    python -m Backend.services.upload_gc
+    python -m Backend.services.upload_gc --delete --grace-hours 24
+"""
+import argparse
+import asyncio
+import os
+import re
+import time
+from datetime import datetime
+from typing import Iterator, NamedTuple, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from Backend.config import get_settings
+from sqlalchemy.orm import sessionmaker
+
+from Backend.database import SessionLocal
+from Backend.models.domain import Product, UploadBlob, WardrobeItem
+from Backend.utils import metrics
+from Backend.utils.derivative_names import DERIVATIVE_NAME, is_derivative
+
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+class GCReport(NamedTuple):
+    scanned: int
+    deleted: int
+    reclaimed_bytes: int
+    finished: bool  # обход дошел до конца каталога и следующий запуск начнется сначала
+
+
+class UploadGarbageCollector:
+    """Инкрементальный обход uploads/ порциями по batch_size файлов.
+
+    Файл считается используемым, если его хэш (или, для старых файлов без хэша в имени, сам путь)
+    встречается в image_url вещей гардероба или товаров - это единственный источник правды о том,
+    нужен ли файл. Оригинал, segmented_* и уменьшенные копии с одним хэшем живут и удаляются вместе.
+    Файлы моложе grace_seconds не трогаются: их могли только что загрузить для распознавания, а вещь
+    еще не сохранили. Возраст считается по mtime файла и по UploadBlob.last_seen_at - повторная
+    загрузка тех же байт продлевает жизнь файлу. Сама таблица UploadBlob - только индекс: ее запись
+    удаляется вслед за файлом.
+    """
+
+    def __init__(self, upload_dir: str, grace_seconds: float = 24 * 3600, batch_size: int = 1000,
+                 session_factory: sessionmaker = SessionLocal):
+        self.upload_dir = upload_dir
+        self.grace_seconds = grace_seconds
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self._cursor: Optional[Tuple[str, ...]] = None
+
+    def collect(self, dry_run: bool = False, batch_size: Optional[int] = None) -> GCReport:
+        started = time.perf_counter()
+        limit = batch_size or self.batch_size
+        expired_before = time.time() - self.grace_seconds
+        referenced_digests, referenced_paths = self._load_references()
+        recent_digests = self._load_recent_digests(expired_before)
+
+        scanned = deleted = reclaimed_bytes = 0
+        deleted_digests: Set[str] = set()
+        finished = True
+        for parts, path in self._iter_files(self.upload_dir, (), self._cursor):
+            if scanned >= limit:
+                finished = False
+                break
+            scanned += 1
+            self._cursor = parts
+
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if stat.st_mtime > expired_before or self._is_referenced(parts, referenced_digests, referenced_paths):
+                continue
+            digest = _DIGEST.search(parts[-1])
+            if digest and digest.group(0) in recent_digests:
+                continue
+
+            if not dry_run:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Failed to delete {path}: {e}")
+                    continue
+            deleted += 1
+            reclaimed_bytes += stat.st_size
+            if digest:
+                deleted_digests.add(digest.group(0))
+
+        if finished:
+            self._cursor = None
+        if deleted_digests and not dry_run:
+            self._forget_blobs(deleted_digests)
+
+        if not dry_run:
+            metrics.increment("uploads.gc.deleted_files", deleted)
+            metrics.increment("uploads.gc.reclaimed_bytes", reclaimed_bytes)
+        metrics.observe("uploads.gc.run_ms", (time.perf_counter() - started) * 1000)
+        return GCReport(scanned=scanned, deleted=deleted, reclaimed_bytes=reclaimed_bytes, finished=finished)
+
+    def _iter_files(self, directory: str, prefix: Tuple[str, ...],
+                    cursor: Optional[Tuple[str, ...]]) -> Iterator[Tuple[Tuple[str, ...], str]]:
+        # Обход в лексикографическом порядке путей, чтобы продолжить с места, где остановился прошлый запуск
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            return
+        for entry in entries:
+            parts = prefix + (entry.name,)
+            if entry.is_dir(follow_symlinks=False):
+                if cursor and parts < cursor[:len(parts)]:
+                    continue
+                yield from self._iter_files(entry.path, parts, cursor)
+            elif entry.is_file(follow_symlinks=False):
+                if cursor and parts <= cursor:
+                    continue
+                yield parts, entry.path
+
+    def _is_referenced(self, parts: Tuple[str, ...], referenced_digests: Set[str], referenced_paths: Set[str]) -> bool:
+        name = parts[-1]
+        # Недописанные временные файлы после сбоя не нужны никому
+        if name.endswith(".tmp"):
+            return False
+
+        if "/".join(parts) in referenced_paths:
+            return True
+
+        digest = _DIGEST.search(name)
+        if digest:
+            return digest.group(0) in referenced_digests
+
+        # Старые загрузки называются <uuid>_<имя файла> (например, <uuid>_image.jpg), поэтому уменьшенной
+        # копией считается только файл с известным размером и форматом копий в имени
+        if is_derivative(name):
+            stem = "/".join(parts[:-1] + (DERIVATIVE_NAME.match(name).group("stem"),))
+            return any(os.path.splitext(path)[0] == stem for path in referenced_paths)
+        return False
+
+    def _load_references(self) -> Tuple[Set[str], Set[str]]:
+        db = self.session_factory()
+        try:
+            urls = [
+                url for (url,) in
+                db.query(WardrobeItem.image_url).filter(WardrobeItem.image_url.like("/uploads/%"))
+                .union(db.query(Product.image_url).filter(Product.image_url.like("/uploads/%")))
+                .all()
+            ]
+        finally:
+            db.close()
+
+        referenced_digests = set()
+        referenced_paths = set()
+        for url in urls:
+            relative_path = url[len("/uploads/"):].split("?", 1)[0]
+            referenced_paths.add(relative_path)
+            digest = _DIGEST.search(relative_path.rsplit("/", 1)[-1])
+            if digest:
+                referenced_digests.add(digest.group(0))
+        return referenced_digests, referenced_paths
+
+    def _load_recent_digests(self, expired_before: float) -> Set[str]:
+        # last_seen_at хранится в UTC без часового пояса, как его пишет UploadRepository
+        seen_after = datetime.utcfromtimestamp(expired_before)
+        db = self.session_factory()
+        try:
+            return {
+                digest for (digest,) in
+                db.query(UploadBlob.digest).filter(UploadBlob.last_seen_at > seen_after).all()
+            }
+        finally:
+            db.close()
+
+    def _forget_blobs(self, digests: Set[str]) -> None:
+        # Запись о файле удаляем, только если самого оригинала на диске больше нет
+        db = self.session_factory()
+        try:
+            blobs = db.query(UploadBlob).filter(UploadBlob.digest.in_(digests)).all()
+            for blob in blobs:
+                if not os.path.exists(blob.path):
+                    db.delete(blob)
+            db.commit()
+        finally:
+            db.close()
+
+
+def get_upload_gc() -> UploadGarbageCollector:
+    settings = get_settings()
+    return UploadGarbageCollector(
+        os.path.join(os.getcwd(), "uploads"),
+        grace_seconds=settings.upload_gc_grace_seconds,
+        batch_size=settings.upload_gc_batch_size
+    )
+
+
+async def run_upload_gc_periodically() -> None:
+    """Фоновая задача приложения: одна порция сборки мусора раз в upload_gc_interval_seconds."""
+    settings = get_settings()
+    collector = get_upload_gc()
+    while True:
+        await asyncio.sleep(settings.upload_gc_interval_seconds)
+        try:
+            report = await run_in_threadpool(collector.collect)
+        except Exception as e:
+            print(f"Upload GC failed: {e}")
+            continue
+        if report.deleted:
+            print(f"Upload GC: deleted {report.deleted} of {report.scanned} files, reclaimed {report.reclaimed_bytes} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delete", action="store_true", help="удалить файлы; без флага только отчет о том, что было бы удалено")
+    parser.add_argument("--grace-hours", type=float, help="по умолчанию upload_gc_grace_seconds из настроек")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    collector = get_upload_gc()
+    if args.grace_hours is not None:
+        collector.grace_seconds = args.grace_hours * 3600
+
+    # Порциями до конца каталога, как это делает фоновая задача, но без пауз
+    scanned = deleted = reclaimed_bytes = 0
+    while True:
+        report = collector.collect(dry_run=not args.delete, batch_size=args.batch_size)
+        scanned += report.scanned
+        deleted += report.deleted
+        reclaimed_bytes += report.reclaimed_bytes
+        if report.finished:
+            break
+
+    action = "deleted" if args.delete else "would delete"
+    print(f"Scanned {scanned} files, {action} {deleted}, reclaimed {reclaimed_bytes / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import re
+
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from Backend.services.derivatives import create_derivative
+from Backend.utils import metrics
+from Backend.utils.derivative_names import DERIVATIVE_NAME, DERIVATIVE_SIZES, derivative_format, is_derivative
+
+# Имя оригинала - SHA-256 его содержимого, поэтому по одному URL всегда одни и те же байты. Результаты
+# сегментации и уменьшенные копии пересоздаются при смене настроек и алгоритма, их клиент перепроверяет
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]+)?$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class UploadsStaticFiles(StaticFiles):
+    """Раздача /uploads с долгим кэшированием и созданием недостающих уменьшенных копий (<имя>_thumb.webp).
+
+    ETag/Last-Modified, ответы 304 и Range-запросы обеспечивает сам StaticFiles; здесь добавляется
+    Cache-Control: оригиналы с хэшем в имени кэшируются навсегда, остальные клиент перепроверяет по ETag.
+    """
+
+    async def get_response(self, path: str, scope: Scope):
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as e:
+            if e.status_code != 404 or not await run_in_threadpool(self._create_missing_derivative, path):
+                raise
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if CONTENT_ADDRESSED_NAME.match(os.path.basename(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        metrics.increment("uploads.not_modified" if response.status_code == 304 else "uploads.served")
+        return response
+
+    def _create_missing_derivative(self, path: str) -> bool:
+        match = DERIVATIVE_NAME.match(os.path.basename(path))
+        if not match or match.group("size") not in DERIVATIVE_SIZES or f".{match.group('ext')}" != derivative_format()[1]:
+            return False
+
+        directory = os.path.realpath(self.directory)
+        folder = os.path.realpath(os.path.join(directory, os.path.dirname(path)))
+        if os.path.commonpath([directory, folder]) != directory or not os.path.isdir(folder):
+            return False
+
+        stem = match.group("stem")
+        for name in os.listdir(folder):
+            if os.path.splitext(name)[0] == stem and not name.endswith(".tmp") and not is_derivative(name):
+                try:
+                    create_derivative(os.path.join(folder, name), match.group("size"))
+                except Exception as e:
+                    print(f"Failed to create derivative {path}: {e}")
+                    return False
+                metrics.increment("uploads.derivatives.lazy")
+                return True
+        return False
@@ -0,0 +1,155 @@
+import hashlib
+import io
+import os
+import uuid
+from functools import lru_cache
+from typing import AsyncIterator, BinaryIO, NamedTuple, Optional, Union
+
+from fastapi import HTTPException, status
+from PIL import Image, UnidentifiedImageError
+from starlette.concurrency import run_in_threadpool
+
+from Backend.config import get_settings
+from Backend.database import SessionLocal
+from Backend.services.derivatives import create_derivatives
+from Backend.repositories.upload_repository import UploadRepository
+
+# Расширение файла определяется по содержимому, а не по имени от клиента: одни и те же байты,
+# присланные как a.jpg и a.JPEG, должны попасть в один файл
+IMAGE_EXTENSIONS = {
+    "JPEG": ".jpg",
+    "MPO": ".jpg",
+    "PNG": ".png",
+    "WEBP": ".webp",
+    "GIF": ".gif",
+    "BMP": ".bmp",
+    "TIFF": ".tiff",
+}
+
+
+class StoredUpload(NamedTuple):
+    digest: str
+    path: str
+    url: str
+    size: int
+    is_new: bool
+
+
+class UploadStore:
+    """Хранилище загрузок с адресацией по SHA-256: одинаковые байты хранятся на диске один раз.
+
+    Файлы раскладываются по подкаталогам uploads/ab/cd/<sha256><ext>, чтобы не держать
+    все загрузки в одной директории; <ext> зависит только от формата изображения. Таблица
+    upload_blobs - индекс сохраненных файлов. Используется ли файл, решает только image_url
+    вещей гардероба и товаров (см. upload_gc).
+    """
+
+    def __init__(self, upload_dir: str):
+        self.upload_dir = upload_dir
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+    def put_bytes(self, data: bytes) -> StoredUpload:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest, image_extension(io.BytesIO(data)))
+
+        is_new = not self._touch(path)
+        if is_new:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Пишем во временный файл и переименовываем: параллельная загрузка тех же байт
+            # не увидит недописанный файл
+            temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            self._create_derivatives(path)
+
+        self._register(digest, path, len(data))
+        return StoredUpload(digest=digest, path=path, url=self.url_for(path), size=len(data), is_new=is_new)
+
+    async def put_stream(self, chunks: AsyncIterator[bytes], max_size: Optional[int] = None) -> StoredUpload:
+        """Сохраняет тело запроса по частям, не собирая его целиком в памяти.
+
+        Хэш считается на лету; при превышении max_size загрузка прерывается с 413.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        temp_path = os.path.join(self.upload_dir, f"{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Image is too large. Maximum size is {max_size} bytes."
+                        )
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            if size == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Failed to save image: empty body"
+                )
+
+            return await run_in_threadpool(self._commit_temp, temp_path, digest.hexdigest(), size)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _commit_temp(self, temp_path: str, digest: str, size: int) -> StoredUpload:
+        with open(temp_path, "rb") as f:
+            path = self.path_for(digest, image_extension(f))
+
+        is_new = not self._touch(path)
+        if is_new:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+            self._create_derivatives(path)
+
+        self._register(digest, path, size)
+        return StoredUpload(digest=digest, path=path, url=self.url_for(path), size=size, is_new=is_new)
+
+    def path_for(self, digest: str, extension: str = "") -> str:
+        return os.path.join(self.shard_dir(digest), f"{digest}{extension}")
+
+    def shard_dir(self, digest: str) -> str:
+        return os.path.join(self.upload_dir, digest[:2], digest[2:4])
+
+    def url_for(self, path: str) -> str:
+        relative_path = os.path.relpath(path, self.upload_dir).replace(os.sep, "/")
+        return f"/uploads/{relative_path}"
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        # Повторная загрузка обновляет mtime, чтобы сборщик мусора отсчитывал grace-период заново
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _create_derivatives(self, path: str) -> None:
+        if get_settings().upload_derivatives_on_upload:
+            create_derivatives(path)
+
+    def _register(self, digest: str, path: str, size: int) -> None:
+        db = SessionLocal()
+        try:
+            UploadRepository(db).register(digest, path, size)
+        finally:
+            db.close()
+
+
+def image_extension(source: Union[BinaryIO, str]) -> str:
+    """Расширение по формату изображения из заголовка файла; для не-изображений - пустое (имя - только хэш)."""
+    try:
+        with Image.open(source) as image:
+            return IMAGE_EXTENSIONS.get(image.format, "")
+    except (UnidentifiedImageError, OSError):
+        return ""
+
+
+@lru_cache()
+def get_upload_store() -> UploadStore:
+    return UploadStore(os.path.join(os.getcwd(), "uploads"))
@@ -1,10 +1,43 @@
 from typing import List, Dict, Optional, Any
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import math
 
-from Backend.repositories.wardrobe_repository import WardrobeRepository
-from Backend.models.schemas import WardrobeItemCreate, WardrobeItemUpdate, WardrobeItemResponse, WardrobeItemsPage
+from Backend.config import get_settings
+from Backend.repositories.wardrobe_repository import AsyncWardrobeRepository, WardrobeRepository
+from Backend.models.schemas import (
+    WardrobeItemCreate,
+    WardrobeItemUpdate,
+    WardrobeItemResponse,
+    WardrobeItemsPage,
+    WardrobeItemsBatchResponse,
+    BatchRecognizeResult,
+    RecognizeIngestResponse
+)
+
+def _item_filters(type: Optional[str], color: Optional[str], season: Optional[str]) -> Dict[str, Any]:
+    filters = {}
+    if type:
+        filters["type"] = type
+    if color:
+        filters["color"] = color
+    if season:
+        filters["season"] = season
+    return filters
+
+
+def _items_page(items, total: int, page: int, size: int) -> WardrobeItemsPage:
+    total_pages = math.ceil(total / size) if total > 0 else 1
+
+    return WardrobeItemsPage(
+        items=[WardrobeItemResponse.model_validate(item) for item in items],
+        total=total,
+        page=page,
+        size=size,
+        pages=total_pages
+    )
+
 
 class WardrobeService:
     def __init__(self, db: Session):
@@ -13,28 +46,12 @@ class WardrobeService:
 
     def get_items(self, user_id: int, page: int = 1, size: int = 10, type: Optional[str] = None,
                  color: Optional[str] = None, season: Optional[str] = None) -> WardrobeItemsPage:
-        filters = {}
-        if type:
-            filters["type"] = type
-        if color:
-            filters["color"] = color
-        if season:
-            filters["season"] = season
-
+        filters = _item_filters(type, color, season)
         skip = (page - 1) * size
 
         items = self.wardrobe_repository.get_items(user_id, skip, size, filters)
         total = self.wardrobe_repository.count_items(user_id, filters)
-
-        total_pages = math.ceil(total / size) if total > 0 else 1
-
-        return WardrobeItemsPage(
-            items=[WardrobeItemResponse.model_validate(item) for item in items],
-            total=total,
-            page=page,
-            size=size,
-            pages=total_pages
-        )
+        return _items_page(items, total, page, size)
 
     def create_item(self, user_id: int, item_data: WardrobeItemCreate) -> WardrobeItemResponse:
         item = self.wardrobe_repository.create_item(
@@ -48,6 +65,42 @@ class WardrobeService:
 
         return WardrobeItemResponse.model_validate(item)
 
+    def create_items(self, user_id: int, items: List[WardrobeItemCreate]) -> WardrobeItemsBatchResponse:
+        max_items = get_settings().wardrobe_batch_max_items
+        if not items:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No items provided"
+            )
+        if len(items) > max_items:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many items. Maximum is {max_items} per request."
+            )
+
+        created = self.wardrobe_repository.create_items(user_id, [item.model_dump() for item in items])
+
+        return WardrobeItemsBatchResponse(items=[WardrobeItemResponse.model_validate(item) for item in created])
+
+    def create_items_from_recognition(self, user_id: int, results: List[BatchRecognizeResult],
+                                      season: str) -> RecognizeIngestResponse:
+        # Каждый распознанный предмет становится вещью гардероба с фотографией, из которой он распознан
+        items = [
+            WardrobeItemCreate(
+                name=f"{detected.type.capitalize()}, {detected.color.lower()}",
+                type=detected.type,
+                color=detected.color,
+                season=season,
+                image_url=result.image_url
+            )
+            for result in results
+            for detected in result.detected_items
+        ]
+
+        created = self.create_items(user_id, items).items if items else []
+
+        return RecognizeIngestResponse(items=created, results=results)
+
     def update_item(self, item_id: int, user_id: int, item_data: WardrobeItemUpdate) -> WardrobeItemResponse:
         update_data = item_data.model_dump(exclude_unset=True)
 
@@ -70,4 +123,21 @@ class WardrobeService:
                 detail="Item not found"
             )
 
-        return True
\ No newline at end of file
+        return True
+
+
+class AsyncWardrobeService:
+    """Чтение гардероба для async-эндпоинтов; изменения остаются в WardrobeService."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.wardrobe_repository = AsyncWardrobeRepository(db)
+
+    async def get_items(self, user_id: int, page: int = 1, size: int = 10, type: Optional[str] = None,
+                        color: Optional[str] = None, season: Optional[str] = None) -> WardrobeItemsPage:
+        filters = _item_filters(type, color, season)
+        skip = (page - 1) * size
+
+        items = await self.wardrobe_repository.get_items(user_id, skip, size, filters)
+        total = await self.wardrobe_repository.count_items(user_id, filters)
+        return _items_page(items, total, page, size)
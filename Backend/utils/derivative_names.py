@@ -0,0 +1,33 @@
+"""Имена и URL уменьшенных копий загрузок: только работа со строками, без PIL."""
+import os
+import re
+from typing import Dict, Optional
+
+from Backend.config import get_settings
+
+# Имя уменьшенной копии -> ограничение по большей стороне в пикселях
+DERIVATIVE_SIZES: Dict[str, int] = {"thumb": 256, "medium": 1024}
+
+DERIVATIVE_FORMATS = {"webp": ("WEBP", ".webp"), "jpeg": ("JPEG", ".jpg")}
+DERIVATIVE_NAME = re.compile(r"^(?P<stem>.+)_(?P<size>[a-z]+)\.(?P<ext>webp|jpg)$")
+
+
+def derivative_format() -> tuple:
+    return DERIVATIVE_FORMATS.get(get_settings().upload_derivative_format, DERIVATIVE_FORMATS["webp"])
+
+
+def derivative_path(original_path: str, size: str) -> str:
+    stem = os.path.splitext(original_path)[0]
+    return f"{stem}_{size}{derivative_format()[1]}"
+
+
+def derivative_url(url: Optional[str], size: str) -> Optional[str]:
+    """URL уменьшенной копии для файла из /uploads; для внешних ссылок возвращает исходный URL."""
+    if not url or not url.startswith("/uploads/"):
+        return url
+    return derivative_path(url, size)
+
+
+def is_derivative(name: str) -> bool:
+    match = DERIVATIVE_NAME.match(name)
+    return bool(match) and match.group("size") in DERIVATIVE_SIZES
@@ -0,0 +1,84 @@
+"""Потоковый разбор multipart/form-data без временного файла."""
+from typing import AsyncIterator, List, Optional
+
+from python_multipart import MultipartParser
+from python_multipart.multipart import parse_options_header
+
+
+class MultipartFileReader:
+    """Отдает байты одного файлового поля по мере чтения тела запроса.
+
+    request.form() сначала складывает все тело во временный файл, и ограничение размера
+    срабатывает только после этого. Здесь данные поля сразу уходят потребителю
+    (UploadStore.put_stream), остальные части пропускаются. Ошибки разбора, отсутствие
+    boundary или нужного поля - ValueError.
+    """
+
+    def __init__(self, content_type: str, field_name: str = "file"):
+        _, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise ValueError("Missing boundary in multipart request")
+
+        self.field_name = field_name
+        self.filename: Optional[str] = None
+        self.found = False
+        self._in_field = False
+        self._pending: List[bytes] = []
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+    async def chunks(self, stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        async for chunk in stream:
+            self._parser.write(chunk)
+            if self._pending:
+                data = b"".join(self._pending)
+                self._pending.clear()
+                yield data
+        self._parser.finalize()
+        if self._pending:
+            yield b"".join(self._pending)
+            self._pending.clear()
+        if not self.found:
+            raise ValueError(f"Multipart request must contain a '{self.field_name}' field")
+
+    def _on_part_begin(self) -> None:
+        self._disposition = b""
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_field:
+            self._pending.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        self._in_field = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        # Берем только первое файловое поле с нужным именем, как request.form(max_files=1)
+        if name == self.field_name and b"filename" in options and not self.found:
+            self.found = True
+            self._in_field = True
+            self.filename = options[b"filename"].decode("utf-8", errors="replace")
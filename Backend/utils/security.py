@@ -1,21 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from Backend.config import get_settings
 from Backend.models.schemas import UserResponse
-from Backend.database import get_db
+from Backend.async_database import get_async_db
+from Backend.utils import metrics
 
 settings = get_settings()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Хэши с другим числом раундов пересчитываются при следующем входе (см. AuthService)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 
+class UserCache:
+    """Кэш проверенных пользователей по email из токена, чтобы не ходить в БД на каждый запрос.
+
+    UserRepository сбрасывает запись при изменении пользователя. Кэш свой у каждого процесса,
+    поэтому изменение, сделанное в другом воркере, видно не позже чем через ttl_seconds.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, UserResponse]]" = OrderedDict()
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, email: str) -> Optional[UserResponse]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[email]
+                entry = None
+            if entry is None:
+                self._misses += 1
+            else:
+                self._entries.move_to_end(email)
+                self._hits += 1
+            hit_ratio = self._hits / (self._hits + self._misses)
+
+        metrics.increment("auth.user_cache.hits" if entry is not None else "auth.user_cache.misses")
+        metrics.set_gauge("auth.user_cache.hit_ratio", round(hit_ratio, 3))
+        return entry[1] if entry is not None else None
+
+    def set(self, email: str, user: UserResponse, version: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            # Пока пользователя читали из БД, его могли изменить: такую версию не кэшируем
+            if version != self._version:
+                return
+            self._entries[email] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.auth_user_cache_size, settings.auth_user_cache_ttl_seconds)
+
+
+def invalidate_cached_user(email: str) -> None:
+    user_cache.invalidate(email)
+
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -35,8 +107,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    from Backend.repositories.user_repository import UserRepository
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    from Backend.repositories.user_repository import AsyncUserRepository
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,10 +123,17 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
 
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_email(email)
+    cached_user = user_cache.get(email)
+    if cached_user is not None:
+        return cached_user
+
+    version = user_cache.version
+    # Асинхронная сессия не блокирует event loop и не занимает поток из threadpool Starlette
+    user = await AsyncUserRepository(db).get_by_email(email)
 
     if user is None:
         raise credentials_exception
 
-    return UserResponse.model_validate(user)
\ No newline at end of file
+    user = UserResponse.model_validate(user)
+    user_cache.set(email, user, version)
+    return user
\ No newline at end of file
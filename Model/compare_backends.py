@@ -0,0 +1,109 @@
+"""Сравнение точности и задержки Keras-модели и экспортированных TFLite-моделей на валидационной выборке.
+
+Валидационная выборка строится так же, как в model.py: каталог ./train/<категория>/,
+train_test_split(test_size=0.2, stratify, random_state=42).
+
+Запуск из корня репозитория:
+    python -m Model.compare_backends v80_4.5fashion_classifier.h5 v80_4.5fashion_classifier.tflite --threads 4
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+from PIL import Image
+from sklearn.model_selection import train_test_split
+
+from Backend.services.inference_backends import create_backend
+
+input_size = (224, 224)
+
+
+def validation_split(train_dir, limit):
+    all_images = []
+    all_labels = []
+    categories = sorted(os.listdir(train_dir))
+    categories = [category for category in categories if os.path.isdir(os.path.join(train_dir, category))]
+    for category in categories:
+        category_path = os.path.join(train_dir, category)
+        for img in os.listdir(category_path):
+            all_images.append(os.path.join(category_path, img))
+            all_labels.append(category)
+
+    _, val_images, _, val_labels = train_test_split(
+        all_images, all_labels, test_size=0.2, stratify=all_labels, random_state=42
+    )
+
+    # flow_from_dataframe нумерует классы в алфавитном порядке
+    class_indices = {category: index for index, category in enumerate(categories)}
+    labels = np.array([class_indices[label] for label in val_labels])
+    if limit:
+        return val_images[:limit], labels[:limit]
+    return val_images, labels
+
+
+def load_batch(paths):
+    return np.stack([
+        np.asarray(Image.open(path).convert('RGB').resize(input_size), dtype=np.float32) / 255.0
+        for path in paths
+    ])
+
+
+def evaluate(model_path, images, labels, batch_size, threads):
+    started = time.perf_counter()
+    backend = create_backend(model_path, threads)
+    load_time = time.perf_counter() - started
+
+    # Прогревочный вызов не учитываем в задержке
+    backend.predict(load_batch(images[:1]))
+
+    predictions = []
+    single_latencies = []
+    batch_latencies = []
+    for start in range(0, len(images), batch_size):
+        batch = load_batch(images[start:start + batch_size])
+
+        started = time.perf_counter()
+        predictions.append(np.argmax(backend.predict(batch), axis=1))
+        batch_latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        backend.predict(batch[:1])
+        single_latencies.append(time.perf_counter() - started)
+
+    predicted = np.concatenate(predictions)
+    return {
+        'backend': backend.name,
+        'load_s': load_time,
+        'accuracy': float(np.mean(predicted == labels)),
+        'single_p50_ms': float(np.percentile(single_latencies, 50) * 1000),
+        'single_p95_ms': float(np.percentile(single_latencies, 95) * 1000),
+        'per_image_batched_ms': float(sum(batch_latencies) / len(images) * 1000),
+        'size_mb': os.path.getsize(model_path) / 1e6,
+        'predicted': predicted,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('models', nargs='+', help='первая модель считается эталоном для сравнения предсказаний')
+    parser.add_argument('--train-dir', default='./train')
+    parser.add_argument('--limit', type=int, default=0, help='ограничить размер валидационной выборки')
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--threads', type=int, default=0)
+    args = parser.parse_args()
+
+    images, labels = validation_split(args.train_dir, args.limit)
+    print(f'Валидационная выборка: {len(images)} изображений')
+
+    results = [evaluate(path, images, labels, args.batch_size, args.threads) for path in args.models]
+    reference = results[0]['predicted']
+
+    print(f"\n{'model':<45} {'backend':<8} {'size,MB':>8} {'acc':>7} {'agree':>7} "
+          f"{'p50,ms':>8} {'p95,ms':>8} {'batch/img,ms':>13} {'load,s':>7}")
+    for path, result in zip(args.models, results):
+        agreement = float(np.mean(result['predicted'] == reference))
+        print(f"{os.path.basename(path):<45} {result['backend']:<8} {result['size_mb']:>8.1f} "
+              f"{result['accuracy'] * 100:>6.2f}% {agreement * 100:>6.2f}% "
+              f"{result['single_p50_ms']:>8.1f} {result['single_p95_ms']:>8.1f} "
+              f"{result['per_image_batched_ms']:>13.2f} {result['load_s']:>7.2f}")
@@ -0,0 +1,76 @@
+"""Экспорт обученного классификатора в TFLite с квантованием для быстрого инференса на CPU.
+
+Примеры:
+    python Model/export_tflite.py v80_4.5fashion_classifier.h5 --quantize float16
+    python Model/export_tflite.py v80_4.5fashion_classifier.h5 --quantize int8 --calibration-dir ./train
+"""
+import argparse
+import os
+import random
+
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+
+input_size = (224, 224)
+
+
+def load_image(path):
+    # Та же предобработка, что и в MLService: RGB, 224x224, значения в [0, 1]
+    image = Image.open(path).convert('RGB').resize(input_size)
+    return np.asarray(image, dtype=np.float32) / 255.0
+
+
+def representative_dataset(calibration_dir, samples):
+    paths = []
+    for root, dirs, files in os.walk(calibration_dir):
+        for file in files:
+            if file.lower().endswith(('.jpg', '.jpeg', '.png')):
+                paths.append(os.path.join(root, file))
+
+    random.Random(42).shuffle(paths)
+
+    def generator():
+        for path in paths[:samples]:
+            yield [np.expand_dims(load_image(path), axis=0)]
+
+    return generator
+
+
+def export(model_path, output_path, quantize, calibration_dir, samples):
+    model = tf.keras.models.load_model(model_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+    if quantize == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantize == 'dynamic':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif quantize == 'int8':
+        if not calibration_dir:
+            raise SystemExit('Для int8 нужен --calibration-dir с изображениями для калибровки')
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset(calibration_dir, samples)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+
+    tflite_model = converter.convert()
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+
+    print(f'Модель сохранена в {output_path}: {os.path.getsize(model_path) / 1e6:.1f} МБ -> '
+          f'{len(tflite_model) / 1e6:.1f} МБ ({quantize})')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('model_path')
+    parser.add_argument('--output', help='по умолчанию рядом с исходной моделью, с расширением .tflite')
+    parser.add_argument('--quantize', choices=['none', 'float16', 'dynamic', 'int8'], default='float16')
+    parser.add_argument('--calibration-dir', help='каталог с изображениями для int8-калибровки, например ./train')
+    parser.add_argument('--samples', type=int, default=200)
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.model_path)[0] + '.tflite'
+    export(args.model_path, output, args.quantize, args.calibration_dir, args.samples)